@@ -3,11 +3,10 @@ from drf_yasg import openapi
 from rest_framework.views import APIView, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.core.cache import cache
-from django.conf import settings
 
-from core.models.city_model import City, District
+from core.reference_cache import get_reference_data
 from core.serializers.city_serializers import CitySerializer, DistrictSerializer
+from utils.conditional import conditional_response
 
 
 class CityListAPIView(APIView):
@@ -24,18 +23,11 @@ class CityListAPIView(APIView):
         }
     )
     def get(self, request):
-        cache_key = 'city_list'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
         try:
-            cities = City.objects.all()
-            if not cities.exists():
+            reference_data = get_reference_data()
+            if not reference_data.cities:
                 return Response({'error': 'No cities found.'}, status=status.HTTP_404_NOT_FOUND)
-            serializer = CitySerializer(cities, many=True)
-            cache.set(cache_key, serializer.data, timeout=settings.TIMEOUT)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return conditional_response(request, reference_data.list_entry('cities', CitySerializer))
         except Exception as e:
             return Response({'error': f'Internal server error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -54,17 +46,10 @@ class DistrictListAPIView(APIView):
         }
     )
     def get(self, request):
-        cache_key = 'district_list'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
         try:
-            districts = District.objects.all()
-            if not districts.exists():
+            reference_data = get_reference_data()
+            if not reference_data.districts:
                 return Response({'error': 'No districts found.'}, status=status.HTTP_404_NOT_FOUND)
-            serializer = DistrictSerializer(districts, many=True)
-            cache.set(cache_key, serializer.data, timeout=settings.TIMEOUT)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return conditional_response(request, reference_data.list_entry('districts', DistrictSerializer))
         except Exception as e:
             return Response({'error': f'Internal server error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
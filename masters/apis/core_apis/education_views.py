@@ -2,12 +2,11 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework.views import APIView, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.core.cache import cache
-from django.conf import settings
 from drf_yasg import openapi
 
-from core.models.education_model import Education
+from core.reference_cache import get_reference_data
 from core.serializers.education_serializer import EducationSerializer
+from utils.conditional import conditional_response
 
 __all__ = [
     'EducationListAPIView'
@@ -30,17 +29,10 @@ class EducationListAPIView(APIView):
     )
     
     def get(self, request):
-        cache_key = f'education_list'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
         try:
-            educations = Education.objects.all()
-            if not educations.exists():
+            reference_data = get_reference_data()
+            if not reference_data.educations:
                 return Response({'error': 'No education entries found.'}, status=status.HTTP_404_NOT_FOUND)
-            serializer = EducationSerializer(educations, many=True)
-            cache.set(cache_key, serializer.data, timeout=settings.TIMEOUT)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return conditional_response(request, reference_data.list_entry('educations', EducationSerializer))
         except Exception as e:
             return Response({'error': f'Internal server error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -1,14 +1,12 @@
-from rest_framework.views import APIView, status
-from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from django.core.cache import cache
-from django.conf import settings
 
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from core.models.language_model import Language
+from core.reference_cache import get_reference_data
 from core.serializers.language_serializer import LanguageSerializer
+from utils.conditional import conditional_response
 
 
 __all__ = [
@@ -32,12 +30,5 @@ class LanguageListAPIView(APIView):
     )
 
     def get(self, request):
-        cache_key = 'language_list'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        languages = Language.objects.all()
-        serializer = LanguageSerializer(languages, many=True)
-        cache.set(cache_key, serializer.data, timeout=settings.TIMEOUT)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        entry = get_reference_data().list_entry('languages', LanguageSerializer)
+        return conditional_response(request, entry)
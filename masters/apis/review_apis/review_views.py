@@ -11,8 +11,11 @@ from drf_yasg import openapi
 from reviews.models.review_models import Review
 from users.models.master_model import Master
 from reviews.serializers.review_serializers import ReviewSerializer
-from utils.paginations import PaginationForMainPage
+from utils.paginations import PaginationForMainPage, ReviewCursorPagination
 from utils.permissions import HeHasPermission
+from utils.master_cache import get_or_set_master_response, request_params_key
+from utils.conditional import conditional_response
+from utils.dynamic_fields import fields_param, expand_param, parse_list_param
 
 __all__ = [
     'ReviewsForMasterAPIView',
@@ -22,24 +25,76 @@ __all__ = [
     'FilterReviewAPIView'
 ]
 
-class ReviewsForMasterAPIView(APIView):
-    permission_classes = [AllowAny]
+pagination_param = openapi.Parameter(
+    'pagination', openapi.IN_QUERY,
+    description="'cursor' göndərilsə, səhifə nömrəsi əvəzinə kursorla səhifələnir",
+    type=openapi.TYPE_STRING
+)
+cursor_param = openapi.Parameter(
+    'cursor', openapi.IN_QUERY, description="Əvvəlki cavabdakı 'next' və ya 'previous' kursoru", type=openapi.TYPE_STRING
+)
+
+
+class ReviewPaginationMixin:
+    """
+    Chooses between page-number pagination (kept for old clients) and
+    keyset pagination on (created_at, id), requested with ?pagination=cursor.
+    """
     pagination_class = PaginationForMainPage
+    cursor_pagination_class = ReviewCursorPagination
+
+    def get_pagination(self, request, oldest=False):
+        if request.query_params.get('pagination') == 'cursor' or 'cursor' in request.query_params:
+            pagination = self.cursor_pagination_class()
+            if oldest:
+                pagination.ordering = ('created_at', 'id')
+            return pagination
+        return self.pagination_class()
+
+    def get_reviews(self, request, reviews):
+        """
+        Narrows the review queryset to the requested `fields` and `expand`.
+        """
+        return ReviewSerializer.setup_queryset(
+            reviews,
+            fields=parse_list_param(request, 'fields'),
+            expand=parse_list_param(request, 'expand'),
+            extra_columns=('created_at',)
+        )
+
+    def get_serializer(self, request, reviews):
+        return ReviewSerializer(
+            reviews,
+            many=True,
+            fields=parse_list_param(request, 'fields'),
+            expand=parse_list_param(request, 'expand')
+        )
+
+
+class ReviewsForMasterAPIView(ReviewPaginationMixin, APIView):
+    permission_classes = [AllowAny]
     http_method_names = ['get']
 
     @swagger_auto_schema(
         operation_description="Verilmiş master ID-yə aid bütün rəyləri gətirir (səhifələnmiş).",
+        manual_parameters=[pagination_param, cursor_param, fields_param, expand_param],
         responses={200: ReviewSerializer(many=True)},
     )
     def get(self, request, master_id):
-        master = get_object_or_404(Master, is_active_on_main_page=True, id=master_id)
+        def build():
+            master = get_object_or_404(Master, is_active_on_main_page=True, id=master_id)
 
-        pagination = self.pagination_class()
-        reviews = Review.objects.filter(master=master)
-        result_page = pagination.paginate_queryset(reviews, request)
-        serializer = ReviewSerializer(result_page, many=True)
-        paginated_response = pagination.get_paginated_response(serializer.data).data
-        return Response(paginated_response, status=status.HTTP_200_OK)
+            pagination = self.get_pagination(request)
+            reviews = Review.objects.filter(master=master).order_by('-created_at', '-id')
+            reviews = self.get_reviews(request, reviews)
+            result_page = pagination.paginate_queryset(reviews, request)
+            serializer = self.get_serializer(request, result_page)
+            return pagination.get_paginated_response(serializer.data).data
+
+        entry = get_or_set_master_response(
+            master_id, 'reviews', build, params=request_params_key(request)
+        )
+        return conditional_response(request, entry)
 
 
 
@@ -108,9 +163,8 @@ class DeleteReviewAPIView(APIView):
         return Response({'message': 'Şərhiniz uğurla silindi'}, status=status.HTTP_204_NO_CONTENT)
 
 
-class FilterReviewAPIView(APIView):
+class FilterReviewAPIView(ReviewPaginationMixin, APIView):
     permission_classes = [AllowAny]
-    pagination_class = PaginationForMainPage
     http_method_names = ['get']
 
     @swagger_auto_schema(
@@ -118,21 +172,31 @@ class FilterReviewAPIView(APIView):
         manual_parameters=[
             openapi.Parameter(
                 'order', openapi.IN_QUERY, description="'newest' və ya 'oldest'", type=openapi.TYPE_STRING
-            )
+            ),
+            pagination_param,
+            cursor_param,
+            fields_param,
+            expand_param
         ],
         responses={200: ReviewSerializer(many=True)}
     )
     def get(self, request, master_id):
-        pagination = self.pagination_class()
-        master = get_object_or_404(Master, is_active_on_main_page=True, id=master_id)
-        order = request.query_params.get('order', 'newest')
-
-        if order == 'oldest':
-            reviews = Review.objects.filter(master=master).order_by('created_at')
-        else:
-            reviews = Review.objects.filter(master=master).order_by('-created_at')
-
-        result_page = pagination.paginate_queryset(reviews, request)
-        serializer = ReviewSerializer(result_page, many=True)
-        paginated_response = pagination.get_paginated_response(serializer.data).data
-        return Response(paginated_response, status=status.HTTP_200_OK)
+        def build():
+            master = get_object_or_404(Master, is_active_on_main_page=True, id=master_id)
+            order = request.query_params.get('order', 'newest')
+            pagination = self.get_pagination(request, oldest=order == 'oldest')
+
+            if order == 'oldest':
+                reviews = Review.objects.filter(master=master).order_by('created_at', 'id')
+            else:
+                reviews = Review.objects.filter(master=master).order_by('-created_at', '-id')
+
+            reviews = self.get_reviews(request, reviews)
+            result_page = pagination.paginate_queryset(reviews, request)
+            serializer = self.get_serializer(request, result_page)
+            return pagination.get_paginated_response(serializer.data).data
+
+        entry = get_or_set_master_response(
+            master_id, 'filtered_reviews', build, params=request_params_key(request)
+        )
+        return conditional_response(request, entry)
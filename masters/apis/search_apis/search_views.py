@@ -1,32 +1,47 @@
-from elasticsearch import Elasticsearch
 from rest_framework.views import APIView
-from django.conf import settings
-from rest_framework.permissions import AllowAny
-from utils.paginations import CustomPagination
+from rest_framework import status
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.permissions import AllowAny, IsAdminUser
+from search.backends import get_search_backend
+from search.metrics import get_search_metrics
+from search.pagination import SearchPagination
+from search.query_builder import normalize_search_params
+from search.result_cache import get_or_set_search_results
+from search.suggest import get_suggestions
+from search.analyzers import transliterate
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.response import Response
 
 __all__ = [
-    'SearchAPIView'
+    'SearchAPIView',
+    'SuggestAPIView',
+    'SearchMetricsAPIView'
 ]
 
-es_client = Elasticsearch(hosts=[settings.ELASTICSEARCH_HOST])
-
 search_param = openapi.Parameter('search', openapi.IN_QUERY, description="Search query", type=openapi.TYPE_STRING)
 profession_category_id_param = openapi.Parameter('profession_category_id', openapi.IN_QUERY, description="Filter by profession category ID", type=openapi.TYPE_INTEGER)
 profession_service_id_param = openapi.Parameter('profession_service_id', openapi.IN_QUERY, description="Filter by profession service ID", type=openapi.TYPE_INTEGER)
 city_id_param = openapi.Parameter('city_id', openapi.IN_QUERY, description="Filter by city ID", type=openapi.TYPE_INTEGER)
 district_id_param = openapi.Parameter('district_id', openapi.IN_QUERY, description="Filter by district ID", type=openapi.TYPE_INTEGER)
 experience_param = openapi.Parameter('experience', openapi.IN_QUERY, description="Filter by exact years of experience", type=openapi.TYPE_INTEGER)
-ordering_param = openapi.Parameter('ordering', openapi.IN_QUERY, description="Field to order by, e.g., 'experience', 'full_name.keyword'", type=openapi.TYPE_STRING)
+ordering_param = openapi.Parameter('ordering', openapi.IN_QUERY, description="Field to order by, e.g., 'experience', 'full_name.keyword', or 'distance' (default when lat/lon are given)", type=openapi.TYPE_STRING)
+lat_param = openapi.Parameter('lat', openapi.IN_QUERY, description="Latitude to search around (requires lon)", type=openapi.TYPE_NUMBER)
+lon_param = openapi.Parameter('lon', openapi.IN_QUERY, description="Longitude to search around (requires lat)", type=openapi.TYPE_NUMBER)
+radius_param = openapi.Parameter('radius', openapi.IN_QUERY, description="Search radius in km around lat/lon (default 10, max 50)", type=openapi.TYPE_NUMBER)
 page_param = openapi.Parameter('page', openapi.IN_QUERY, description="Page number", type=openapi.TYPE_INTEGER)
 page_size_param = openapi.Parameter('page_size', openapi.IN_QUERY, description="Page size (max 100)", type=openapi.TYPE_INTEGER)
+pagination_param = openapi.Parameter('pagination', openapi.IN_QUERY, description="'cursor' for deep paging with search_after", type=openapi.TYPE_STRING)
+facets_param = openapi.Parameter('facets', openapi.IN_QUERY, description="'true' to include facet counts per category, service, city, district and experience range", type=openapi.TYPE_BOOLEAN)
+cursor_param = openapi.Parameter('cursor', openapi.IN_QUERY, description="Opaque cursor from the previous response's 'next' link", type=openapi.TYPE_STRING)
 
 class SearchAPIView(APIView):
     """
     Search API for filtering masters based on various parameters like
     profession, location, experience, and keyword search.
+
+    Served by Elasticsearch, or by PostgreSQL full-text search while
+    Elasticsearch is failing (see search.backends).
     """
     
     permission_classes = [AllowAny]
@@ -40,130 +55,92 @@ class SearchAPIView(APIView):
             city_id_param,
             district_id_param,
             experience_param,
+            lat_param,
+            lon_param,
+            radius_param,
             ordering_param,
             page_param,
-            page_size_param
+            page_size_param,
+            pagination_param,
+            cursor_param,
+            facets_param
         ],
         operation_summary="Search and filter masters",
         operation_description="Search with filters and keywords"
     )
     def get(self, request):
-        profession_category_id = request.GET.get('profession_category_id')
-        profession_service_id = request.GET.get('profession_service_id')
-        city_id = request.GET.get('city_id')
-        district_id = request.GET.get('district_id')
-        experience = request.GET.get('experience')
-        search_query = request.GET.get('search')
-        ordering = request.GET.get('ordering')
-
-        must_filters = []
-
-        if profession_category_id:
-            must_filters.append({
-                "term": {"profession_category.id": int(profession_category_id)}
-            })
-
-        if profession_service_id:
-            must_filters.append({
-                "term": {"profession_service.id": int(profession_service_id)}
-            })
-
-        if city_id:
-            must_filters.append({
-                "nested": {
-                    "path": "cities",
-                    "query": {
-                        "term": {"cities.id": int(city_id)}
-                    }
-                }
-            })
-
-        if district_id:
-            must_filters.append({
-                "nested": {
-                    "path": "districts",
-                    "query": {
-                        "term": {"districts.id": int(district_id)}
-                    }
-                }
-            })
-
-        if experience:
-            try:
-                must_filters.append({
-                    "term": {"experience": int(experience)}
-                })
-            except ValueError:
-                pass
-
-        # Əsas query qurulması
-        bool_query = {
-            "must": must_filters  # İlk növbədə filter kimi istifadə olunan termlər must-dadır
-        }
-
-        if search_query:
-            # search_query varsa, onu must-ə əlavə et
-            bool_query["must"].append({
-                "multi_match": {
-                    "query": search_query,
-                    "fields": [
-                        "full_name",
-                        "custom_profession",
-                        "profession_category.name",
-                        "profession_service.name"
-                    ]
-                }
-            })
-
-            # cities və districts üçün nested match-lər də əlavə etmək istəsən, onları da must-ə əlavə et
-            bool_query["must"].extend([
-                {
-                    "nested": {
-                        "path": "cities",
-                        "query": {
-                            "match": {"cities.name": search_query}
-                        }
-                    }
-                },
-                {
-                    "nested": {
-                        "path": "districts",
-                        "query": {
-                            "match": {"districts.name": search_query}
-                        }
-                    }
-                }
-            ])
-
-        query_body = {
-            "query": {
-                "bool": bool_query
-            }
-        }
-
-        if ordering:
-            query_body["sort"] = [ordering]
+        params = normalize_search_params(request.query_params)
+        backend = get_search_backend()
+        pagination = SearchPagination()
+
+        def search():
+            return backend.search(params, request)
+
+        # Cursor pages belong to a point-in-time, so only page-number results are shared.
+        if pagination.use_cursor(request):
+            return Response(search())
+
+        cache_params = dict(
+            params,
+            page=pagination.get_page_number(request),
+            page_size=pagination.get_page_size(request)
+        )
+        return Response(get_or_set_search_results(cache_params, search))
+
+
+class SuggestAPIView(APIView):
+    """
+    Type-ahead suggestions for the search box.
+
+    Returns masters, categories, services, cities and districts whose names
+    start with the typed prefix, using only the completion suggester.
+    """
+
+    permission_classes = [AllowAny]
+    http_method_names = ['get']
+    min_prefix_length = 2
+    default_size = 8
+    max_size = 20
 
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, description="Typed prefix (at least 2 characters)", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('size', openapi.IN_QUERY, description="Number of suggestions (max 20)", type=openapi.TYPE_INTEGER),
+        ],
+        operation_summary="Autocomplete suggestions",
+        operation_description="Mixed suggestions typed as master, category, service, city or district"
+    )
+    def get(self, request):
+        prefix = transliterate(' '.join((request.GET.get('q') or '').split())).lower()
         try:
-            page = int(request.GET.get('page', 1))
-            page_size = min(
-                int(request.GET.get('page_size', CustomPagination.page_size)),
-                CustomPagination.max_page_size
-            )
+            size = min(max(int(request.GET.get('size', self.default_size)), 1), self.max_size)
         except ValueError:
-            page = 1
-            page_size = CustomPagination.page_size
+            size = self.default_size
 
-        from_ = (page - 1) * page_size
+        if len(prefix) < self.min_prefix_length:
+            return Response({'suggestions': []})
 
-        response = es_client.search(
-            index="masters",
-            body=query_body,
-            size=page_size,
-            from_=from_
+        suggestions = get_or_set_search_results(
+            {'suggest': prefix, 'size': size},
+            lambda: get_suggestions(prefix, size)
         )
+        # None when Elasticsearch could not answer; such results are not cached.
+        return Response({'suggestions': suggestions or []})
+
 
-        results = [hit["_source"] for hit in response["hits"]["hits"]]
-        pagination = CustomPagination()
-        result_page = pagination.paginate_queryset(results, request, view=self)
-        return pagination.get_paginated_response(result_page)
+class SearchMetricsAPIView(APIView):
+    """
+    get:
+    Return the latency of master searches aggregated per query shape,
+    slowest first. Available to staff users only.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdminUser]
+    http_method_names = ['get']
+
+    @swagger_auto_schema(
+        operation_summary="Axtarış sorğularının statistikası",
+        responses={200: openapi.Response('Sorğu formalarına görə gecikmə')}
+    )
+    def get(self, request):
+        return Response(get_search_metrics(), status=status.HTTP_200_OK)
@@ -1,5 +1,5 @@
 from django.urls import path
-from apis.search_apis.search_views import SearchAPIView
+from apis.search_apis.search_views import SearchAPIView, SuggestAPIView, SearchMetricsAPIView
 
 app_name = 'search_apis'
 
@@ -9,4 +9,14 @@ urlpatterns = [
         SearchAPIView.as_view(),
         name='master-search'
     ),
+    path(
+        'masters/search/suggest/',
+        SuggestAPIView.as_view(),
+        name='master-search-suggest'
+    ),
+    path(
+        'masters/search/metrics/',
+        SearchMetricsAPIView.as_view(),
+        name='master-search-metrics'
+    ),
 ]
\ No newline at end of file
@@ -2,16 +2,16 @@ from rest_framework.views import APIView, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404
-from django.core.cache import cache
-from django.conf import settings
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from core.reference_cache import get_reference_data
 from services.models.category_model import Category
 from services.serializers.category_serializer import CategorySerializer
 from utils.paginations import CustomPagination
 from users.models.master_model import Master
-from users.serializers.master_serializer import MasterSerializer
+from users.serializers.master_serializer import MasterCardSerializer
+from utils.conditional import conditional_response
 
 __all__ = [
     'CategoryListAPIView',
@@ -39,18 +39,8 @@ class CategoryListAPIView(APIView):
     )
 
     def get(self, request):
-        cache_key = f'category_list'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        try:
-            categories = Category.objects.all()
-            serializer = CategorySerializer(categories, many=True)
-            cache.set(cache_key, serializer.data, timeout=settings.TIMEOUT)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Category.DoesNotExist:
-            return Response({'error': 'Heç bir kategoriya tapılmadı'}, status=status.HTTP_404_NOT_FOUND)
+        entry = get_reference_data().list_entry('categories', CategorySerializer)
+        return conditional_response(request, entry)
 
 
 class MasterListForCategoryAPIView(APIView):
@@ -74,18 +64,20 @@ class MasterListForCategoryAPIView(APIView):
     
     @swagger_auto_schema(
         operation_summary="Kateqoriya üzrə aktiv ustaları qaytarır",
-        responses={200: MasterSerializer(many=True)}
+        responses={200: MasterCardSerializer(many=True)}
     )
 
     def get(self, request, category_id):
         pagination = self.pagination_class()
         category = get_object_or_404(Category, id=category_id)
-        masters = Master.objects.filter(profession_category=category, is_active_on_main_page=True)
+        masters = MasterCardSerializer.setup_queryset(
+            Master.objects.filter(profession_category=category, is_active_on_main_page=True)
+        )
         if not masters.exists():
             return Response({
                 'error': 'Hal-hazırda bu kateqoriyaya uyğun aktiv bir usta yoxdur'
             }, status=status.HTTP_404_NOT_FOUND)
         result_page = pagination.paginate_queryset(masters, request)
-        serializer = MasterSerializer(result_page, many=True)
+        serializer = MasterCardSerializer(result_page, many=True)
         paginated_response = pagination.get_paginated_response(serializer.data).data
         return Response(paginated_response, status=status.HTTP_200_OK)
\ No newline at end of file
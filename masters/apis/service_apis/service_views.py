@@ -2,20 +2,19 @@ from rest_framework.views import APIView, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
-from django.core.cache import cache
-from django.conf import settings
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from services.models.category_model import Category
+from core.reference_cache import get_reference_data
 from services.models.service_model import Service
 from services.serializers.service_serializer import ServiceSerializer
 from users.models.master_model import Master
-from users.serializers.master_serializer import MasterSerializer
-from reviews.models.review_models import Review
+from users.serializers.master_serializer import MasterCardSerializer
 from utils.paginations import CustomPagination
+from utils.conditional import conditional_response
+from utils.platform_statistics import get_platform_statistics
 
 __all__ = [
     'ServicesForCategoryAPIView',
@@ -45,18 +44,8 @@ class ServiceListAPIView(APIView):
     )
 
     def get(self, request):
-        cache_key = f'services_list'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-
-        try:
-            services = Service.objects.all()
-            serializer = ServiceSerializer(services, many=True)
-            cache.set(cache_key, serializer.data, timeout=settings.TIMEOUT)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        except Category.DoesNotExist:
-            return Response({'error': 'Heç bir servis tapılmadı'}, status=status.HTTP_404_NOT_FOUND)
+        entry = get_reference_data().list_entry('services', ServiceSerializer)
+        return conditional_response(request, entry)
 
 
 class ServicesForCategoryAPIView(APIView):
@@ -80,16 +69,11 @@ class ServicesForCategoryAPIView(APIView):
     )
 
     def get(self, request, category_id):
-        cache_key = f'services_for_category_{category_id}'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
-      
-        category = get_object_or_404(Category, id=category_id)
-        services = Service.objects.filter(category=category)
-        serializer = ServiceSerializer(services, many=True)
-        cache.set(cache_key, serializer.data, timeout=settings.TIMEOUT)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        reference_data = get_reference_data()
+        if reference_data.categories.get(category_id) is None:
+            raise Http404('No Category matches the given query.')
+        entry = reference_data.list_entry('services', ServiceSerializer, category_id=category_id)
+        return conditional_response(request, entry)
 
 
 class MasterListForServicesAPIView(APIView):
@@ -112,19 +96,21 @@ class MasterListForServicesAPIView(APIView):
     
     @swagger_auto_schema(
         operation_summary="Kateqoriya üzrə aktiv ustaları qaytarır",
-        responses={200: MasterSerializer(many=True)}
+        responses={200: MasterCardSerializer(many=True)}
     )
 
     def get(self, request, service_id):
         pagination = self.pagination_class()
         service = get_object_or_404(Service, id=service_id)
-        masters = Master.objects.filter(profession_service=service, is_active_on_main_page=True)
+        masters = MasterCardSerializer.setup_queryset(
+            Master.objects.filter(profession_service=service, is_active_on_main_page=True)
+        )
         if not masters.exists():
             return Response({
                 'error': 'Hal-hazırda bu servisə uyğun aktiv bir usta yoxdur'
             }, status=status.HTTP_404_NOT_FOUND)
         result_page = pagination.paginate_queryset(masters, request)
-        serializer = MasterSerializer(result_page, many=True)
+        serializer = MasterCardSerializer(result_page, many=True)
         paginated_response = pagination.get_paginated_response(serializer.data).data
         return Response(paginated_response, status=status.HTTP_200_OK)
     
@@ -151,26 +137,8 @@ def statistics_view(request):
     - Active masters (as range)
     - Service type count
     - Average rating
+
+    Served from the precomputed statistics record through the cache,
+    see `utils.platform_statistics.get_platform_statistics`.
     """
-    
-    master_count = Master.objects.filter(is_active_on_main_page=True).count()
-    category_count = Category.objects.count()
-    avg_rating = Review.objects.aggregate(avg=Avg('rating'))['avg'] or 0.0
-
-    if master_count <= 50:
-        master_count_label = str(master_count)
-    elif master_count <= 100:
-        master_count_label = "100+"
-    elif master_count <= 200:
-        master_count_label = "200+"
-    elif master_count <= 500:
-        master_count_label = "500+"
-    else:
-        master_count_label = "1000+"
-
-    data = {
-        "usta_sayi": master_count_label,
-        "xidmet_novu": category_count,
-        "ortalama_reytinq": round(avg_rating, 2),
-    }
-    return Response(data)
+    return Response(get_platform_statistics())
@@ -11,6 +11,8 @@ from users.models.master_model import Master
 from users.models.master_work_img_model import MasterWorkImage
 from users.serializers.master_image_serializer import MasterImageSerializer
 from utils.permissions import HeHasPermission
+from utils.master_cache import get_or_set_master_response
+from utils.conditional import conditional_response
 
 __all__ = [
     'WorkImagesForMasterAPIView',
@@ -36,10 +38,13 @@ class WorkImagesForMasterAPIView(APIView):
     )
     
     def get(self, request, master_id):
-        master = get_object_or_404(Master, is_active_on_main_page=True, id=master_id)
-        images = MasterWorkImage.objects.filter(master=master)
-        serializer = MasterImageSerializer(images, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def build():
+            master = get_object_or_404(Master, is_active_on_main_page=True, id=master_id)
+            images = MasterWorkImage.objects.filter(master=master)
+            return MasterImageSerializer(images, many=True).data
+
+        entry = get_or_set_master_response(master_id, 'work_images', build)
+        return conditional_response(request, entry)
 
 
 class CreateWorkImagesForMasterAPIView(APIView):
@@ -1,21 +1,30 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Avg, Count
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 from users.models.master_model import Master
-from users.serializers.master_serializer import MasterSerializer
+from users.serializers.master_serializer import MasterSerializer, MasterCardSerializer, NearbyMasterSerializer
 from utils.paginations import CustomPagination, PaginationForMainPage
+from utils.master_cache import (
+    get_or_set_master_response, get_many_master_responses, get_master_cache_stats, request_params_key
+)
+from utils.conditional import conditional_response
+from utils.geo import filter_nearby
+from utils.dynamic_fields import fields_param, expand_param, parse_list_param
 
 __all__ = [
     'MastersListAPIView',
     'TopRatedMastersListAPIView',
-    'MasterDetailAPIView'
+    'NearbyMastersListAPIView',
+    'MasterBatchAPIView',
+    'MasterDetailAPIView',
+    'MasterCacheStatsAPIView'
 ]
 
 
@@ -31,22 +40,21 @@ class MastersListAPIView(APIView):
     @swagger_auto_schema(
         operation_summary="Aktiv ustaların siyahısı",
         operation_description="Orta reytinq və rəy sayı ilə birlikdə aktiv ustaları göstərir.",
-        responses={200: MasterSerializer(many=True)}
+        responses={200: MasterCardSerializer(many=True)}
     )
 
     def get(self, request):
         pagination = self.pagination_class()
-        masters = Master.objects.annotate(
-            avg_rating=Avg('reviews__rating'),
-            count_ratings=Count('reviews')
-        ).filter(is_active_on_main_page=True)
+        masters = MasterCardSerializer.setup_queryset(
+            Master.objects.filter(is_active_on_main_page=True)
+        )
         
         if not masters.exists():
             return Response({
                 'error': 'Hal-hazırda aktiv bir usta yoxdur'
             }, status=status.HTTP_404_NOT_FOUND)
         result_page = pagination.paginate_queryset(masters, request)
-        serializer = MasterSerializer(result_page, many=True)
+        serializer = MasterCardSerializer(result_page, many=True)
         paginated_response = pagination.get_paginated_response(serializer.data).data
         return Response(paginated_response, status=status.HTTP_200_OK)
 
@@ -54,7 +62,8 @@ class MastersListAPIView(APIView):
 class TopRatedMastersListAPIView(APIView):
     """
     get:
-    Return a list of top-rated active masters sorted by rating, review count, and last login.
+    Return a list of top-rated active masters sorted by their stored Bayesian
+    ranking score and last login.
     """
     permission_classes = [AllowAny]
     pagination_class = PaginationForMainPage
@@ -62,27 +71,140 @@ class TopRatedMastersListAPIView(APIView):
     
     @swagger_auto_schema(
         operation_summary="Ən yüksək reytinqli ustalar",
-        operation_description="Reytinqə, rəy sayına və son daxil olmağa görə sıralanmış aktiv ustalar.",
-        responses={200: MasterSerializer(many=True)}
+        operation_description="Reytinq balına (rəy sayı nəzərə alınmaqla) və son daxil olmağa görə sıralanmış aktiv ustalar.",
+        responses={200: MasterCardSerializer(many=True)}
     )
 
     def get(self, request):
         pagination = self.pagination_class()
-        masters = Master.objects.annotate(
-            avg_rating=Avg('reviews__rating'),
-            count_ratings=Count('reviews')
-        ).filter(is_active_on_main_page=True).order_by('-avg_rating', '-count_ratings', '-last_login')
+        masters = MasterCardSerializer.setup_queryset(
+            Master.objects.filter(is_active_on_main_page=True)
+        ).order_by('-ranking_score', '-last_login')
         
         if not masters.exists():
             return Response({
                 'error': 'Hal-hazırda aktiv bir usta yoxdur'
             }, status=status.HTTP_404_NOT_FOUND)
         result_page = pagination.paginate_queryset(masters, request)
-        serializer = MasterSerializer(result_page, many=True)
+        serializer = MasterCardSerializer(result_page, many=True)
         paginated_response = pagination.get_paginated_response(serializer.data).data
         return Response(paginated_response, status=status.HTTP_200_OK)
 
 
+class NearbyMastersListAPIView(APIView):
+    """
+    get:
+    List active masters within a radius of a point, nearest first.
+
+    Query Parameters:
+    - lat, lon (float): The point to search around. Required.
+    - radius (float): Search radius in kilometres. Defaults to 10, at most 50.
+    - category_id, service_id (int): Optional profession filters.
+    """
+    permission_classes = [AllowAny]
+    pagination_class = CustomPagination
+    http_method_names = ['get']
+    default_radius_km = 10
+    max_radius_km = 50
+
+    @swagger_auto_schema(
+        operation_summary="Yaxınlıqdakı ustalar",
+        operation_description="Verilmiş nöqtəyə ən yaxın aktiv ustaları məsafəyə görə sıralayır.",
+        manual_parameters=[
+            openapi.Parameter('lat', openapi.IN_QUERY, description="Enlik", type=openapi.TYPE_NUMBER, required=True),
+            openapi.Parameter('lon', openapi.IN_QUERY, description="Uzunluq", type=openapi.TYPE_NUMBER, required=True),
+            openapi.Parameter('radius', openapi.IN_QUERY, description="Radius (km, maksimum 50)", type=openapi.TYPE_NUMBER),
+            openapi.Parameter('category_id', openapi.IN_QUERY, description="Kateqoriya ID", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('service_id', openapi.IN_QUERY, description="Xidmət ID", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: NearbyMasterSerializer(many=True), 400: 'Koordinatlar səhvdir'}
+    )
+
+    def get(self, request):
+        try:
+            latitude = float(request.query_params['lat'])
+            longitude = float(request.query_params['lon'])
+            radius = float(request.query_params.get('radius', self.default_radius_km))
+            category_id = request.query_params.get('category_id')
+            service_id = request.query_params.get('service_id')
+            category_id = int(category_id) if category_id else None
+            service_id = int(service_id) if service_id else None
+        except (KeyError, ValueError):
+            return Response({'error': 'lat, lon və radius düzgün daxil edilməlidir'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or not 0 < radius <= self.max_radius_km:
+            return Response({'error': 'Koordinatlar və ya radius icazə verilən aralıqda deyil'}, status=status.HTTP_400_BAD_REQUEST)
+
+        masters = Master.objects.filter(is_active_on_main_page=True)
+        if category_id:
+            masters = masters.filter(profession_category_id=category_id)
+        if service_id:
+            masters = masters.filter(profession_service_id=service_id)
+        masters = MasterCardSerializer.setup_queryset(
+            filter_nearby(masters, latitude, longitude, radius)
+        )
+
+        pagination = self.pagination_class()
+        result_page = pagination.paginate_queryset(masters, request)
+        serializer = NearbyMasterSerializer(result_page, many=True)
+        paginated_response = pagination.get_paginated_response(serializer.data).data
+        return Response(paginated_response, status=status.HTTP_200_OK)
+
+
+class MasterBatchAPIView(APIView):
+    """
+    get:
+    Return the cards of several active masters in one response,
+    e.g. for favorites or recently viewed lists.
+
+    Query Parameters:
+    - ids (str): Comma separated master IDs, at most MASTER_BATCH_MAX_IDS.
+
+    Cards are read from the per-master cache in one multi-get; only the
+    missed ones are loaded, with a single prefetched query. IDs that do not
+    belong to an active master are listed under `missing`.
+    """
+    permission_classes = [AllowAny]
+    http_method_names = ['get']
+
+    @swagger_auto_schema(
+        operation_summary="Bir neçə ustanı bir sorğu ilə gətir",
+        manual_parameters=[
+            openapi.Parameter(
+                'ids', openapi.IN_QUERY, description="Vergüllə ayrılmış usta ID-ləri", type=openapi.TYPE_STRING, required=True
+            ),
+        ],
+        responses={200: openapi.Response('Usta kartları və tapılmayan ID-lər'), 400: 'ID-lər səhvdir'}
+    )
+
+    def get(self, request):
+        try:
+            ids = [int(master_id) for master_id in request.query_params.get('ids', '').split(',') if master_id.strip()]
+        except ValueError:
+            return Response({'error': 'ID-lər tam ədəd olmalıdır'}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return Response({'error': 'Ən azı bir ID göndərilməlidir'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > settings.MASTER_BATCH_MAX_IDS:
+            return Response(
+                {'error': f'Ən çox {settings.MASTER_BATCH_MAX_IDS} ID göndərmək olar'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        def build(missed_ids):
+            masters = MasterCardSerializer.setup_queryset(
+                Master.objects.filter(id__in=missed_ids, is_active_on_main_page=True)
+            )
+            return {master.id: MasterCardSerializer(master).data for master in masters}
+
+        cards = get_many_master_responses(ids, 'card', build)
+        return Response({
+            'results': [cards[master_id] for master_id in ids if master_id in cards],
+            'missing': [master_id for master_id in ids if master_id not in cards],
+        }, status=status.HTTP_200_OK)
+
+
 class MasterDetailAPIView(APIView):
     """
     get:
@@ -100,14 +222,24 @@ class MasterDetailAPIView(APIView):
     
     @swagger_auto_schema(
         operation_summary="Usta məlumatlarını göstər",
+        manual_parameters=[fields_param, expand_param],
         responses={200: MasterSerializer()}
     )
 
 
     def get(self, request, master_id):
-        master = get_object_or_404(Master, id=master_id, is_active_on_main_page=True)
-        serializer = MasterSerializer(master)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields = parse_list_param(request, 'fields')
+        expand = parse_list_param(request, 'expand')
+
+        def build():
+            masters = MasterSerializer.setup_queryset(Master.objects.all(), fields=fields, expand=expand)
+            master = get_object_or_404(masters, id=master_id, is_active_on_main_page=True)
+            return MasterSerializer(master, fields=fields, expand=expand).data
+
+        entry = get_or_set_master_response(
+            master_id, 'detail', build, params=request_params_key(request)
+        )
+        return conditional_response(request, entry)
     
     @swagger_auto_schema(
         operation_summary="Ustanı yenilə",
@@ -147,3 +279,22 @@ class MasterDetailAPIView(APIView):
         
         master.delete()
         return Response({'message': 'Hesab silindi'}, status=status.HTTP_204_NO_CONTENT)
+
+
+class MasterCacheStatsAPIView(APIView):
+    """
+    get:
+    Return hit and miss counters of the per-master response cache.
+    Available to staff users only.
+    """
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAdminUser]
+    http_method_names = ['get']
+
+    @swagger_auto_schema(
+        operation_summary="Usta keşinin statistikası",
+        responses={200: openapi.Response('Keş statistikası')}
+    )
+
+    def get(self, request):
+        return Response(get_master_cache_stats(), status=status.HTTP_200_OK)
@@ -62,11 +62,27 @@ urlpatterns = [
         name='masters-top-rated-list '
     ),
 
+    path(
+        'masters/nearby/',
+        NearbyMastersListAPIView.as_view(),
+        name='masters-nearby'
+    ),
+    path(
+        'masters/batch/',
+        MasterBatchAPIView.as_view(),
+        name='masters-batch'
+    ),
+
     path(
         'masters/<int:master_id>/', 
         MasterDetailAPIView.as_view(),
         name='master-detail'
     ), 
+    path(
+        'masters/cache/stats/',
+        MasterCacheStatsAPIView.as_view(),
+        name='master-cache-stats'
+    ),
    
     # path(
     #     'masters/search/', 
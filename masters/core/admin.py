@@ -2,6 +2,7 @@ from django.contrib import admin
 from core.models.city_model import City, District
 from core.models.education_model import Education
 from core.models.language_model import Language
+from core.models.statistics_model import PlatformStatistics
 
 
 class CityAdmin(admin.ModelAdmin):
@@ -28,9 +29,15 @@ class LanguageAdmin(admin.ModelAdmin):
     ordering = ('display_name',)
 
 
+class PlatformStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('active_master_count', 'category_count', 'rating_count', 'recalculated_at', 'updated_at')
+    readonly_fields = ('recalculated_at', 'updated_at')
+
+
 # Adminə qeydiyyat
 admin.site.register(City, CityAdmin)
 admin.site.register(District, DistrictAdmin)
 admin.site.register(Education, EducationAdmin)
 admin.site.register(Language, LanguageAdmin)
+admin.site.register(PlatformStatistics, PlatformStatisticsAdmin)
 
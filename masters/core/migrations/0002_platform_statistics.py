@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:18
+
+from django.db import migrations, models
+from django.db.models import Sum
+from django.utils import timezone
+
+
+def populate_platform_statistics(apps, schema_editor):
+    PlatformStatistics = apps.get_model('core', 'PlatformStatistics')
+    Master = apps.get_model('users', 'Master')
+    Category = apps.get_model('services', 'Category')
+    MasterRatingSummary = apps.get_model('reviews', 'MasterRatingSummary')
+
+    ratings = MasterRatingSummary.objects.aggregate(
+        rating_sum=Sum('rating_sum'),
+        rating_count=Sum('rating_count')
+    )
+    PlatformStatistics.objects.update_or_create(pk=1, defaults={
+        'active_master_count': Master.objects.filter(is_active_on_main_page=True).count(),
+        'category_count': Category.objects.count(),
+        'rating_sum': ratings['rating_sum'] or 0,
+        'rating_count': ratings['rating_count'] or 0,
+        'recalculated_at': timezone.now(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('services', '0001_initial'),
+        ('users', '0003_master_geohash'),
+        ('reviews', '0002_master_rating_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active_master_count', models.PositiveIntegerField(default=0)),
+                ('category_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveBigIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('recalculated_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Platforma statistikası',
+                'verbose_name_plural': 'Platforma statistikası',
+            },
+        ),
+        migrations.RunPython(populate_platform_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,6 @@
+from .city_model import City, District
+from .education_model import Education
+from .language_model import Language
+from .statistics_model import PlatformStatistics
+
+__all__ = ['City', 'District', 'Education', 'Language', 'PlatformStatistics']
@@ -0,0 +1,80 @@
+from django.apps import apps
+from django.db import models
+from django.db.models import F, Sum
+from django.utils import timezone
+
+
+class PlatformStatisticsManager(models.Manager):
+    """
+    Manager for the single precomputed platform statistics record.
+    """
+
+    def get_solo(self):
+        """
+        Returns the statistics record, creating it from a full recalculation on first use.
+        """
+        statistics = self.filter(pk=1).first()
+        if statistics is None:
+            statistics = self.recalculate()
+        return statistics
+
+    def recalculate(self):
+        """
+        Recomputes every figure from the source tables.
+        Run periodically to repair any drift of the incremental updates.
+        """
+        Master = apps.get_model('users', 'Master')
+        Category = apps.get_model('services', 'Category')
+        MasterRatingSummary = apps.get_model('reviews', 'MasterRatingSummary')
+
+        ratings = MasterRatingSummary.objects.aggregate(
+            rating_sum=Sum('rating_sum'),
+            rating_count=Sum('rating_count')
+        )
+        statistics, _ = self.update_or_create(pk=1, defaults={
+            'active_master_count': Master.objects.filter(is_active_on_main_page=True).count(),
+            'category_count': Category.objects.count(),
+            'rating_sum': ratings['rating_sum'] or 0,
+            'rating_count': ratings['rating_count'] or 0,
+            'recalculated_at': timezone.now(),
+        })
+        return statistics
+
+    def apply_delta(self, **deltas):
+        """
+        Adjusts the counters with atomic F() updates, e.g. apply_delta(active_master_count=1).
+        Does nothing until the record has been created by `recalculate`.
+        """
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if updates:
+            self.filter(pk=1).update(updated_at=timezone.now(), **updates)
+
+
+class PlatformStatistics(models.Model):
+    """
+    Single-row table with the figures shown on the landing page.
+
+    Kept current incrementally by signals on masters, categories and reviews,
+    and fully recalculated by a periodic Celery task.
+    """
+    active_master_count = models.PositiveIntegerField(default=0)
+    category_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveBigIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    recalculated_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PlatformStatisticsManager()
+
+    class Meta:
+        verbose_name = 'Platforma statistikası'
+        verbose_name_plural = 'Platforma statistikası'
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return 0.0
+        return round(self.rating_sum / self.rating_count, 2)
+
+    def __str__(self):
+        return 'Platform statistics'
@@ -0,0 +1,164 @@
+import threading
+import time
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models.city_model import City, District
+from core.models.education_model import Education
+from core.models.language_model import Language
+from services.models.category_model import Category
+from services.models.service_model import Service
+from utils.conditional import make_cache_entry
+
+
+VERSION_KEY = 'reference:version'
+SNAPSHOT_KEY = 'reference:snapshot:v{version}'
+
+# Snapshot attribute for each reference model.
+REFERENCE_TABLES = {
+    'cities': City,
+    'districts': District,
+    'categories': Category,
+    'services': Service,
+    'languages': Language,
+    'educations': Education,
+}
+
+_lock = threading.Lock()
+_snapshot = None
+_checked_at = 0
+
+
+class ReferenceTable:
+    """
+    Read-only rows of one reference table, in id order, with lookups by id
+    and by case-insensitive name.
+
+    The rows are shared by every request of the process and must not be modified.
+    """
+
+    def __init__(self, rows):
+        self.rows = tuple(rows)
+        self.by_id = MappingProxyType({row.pk: row for row in self.rows})
+        self.by_name = MappingProxyType({row.name.lower(): row for row in self.rows})
+
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled; the lookups are rebuilt from the rows.
+        return (ReferenceTable, (self.rows,))
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, pk):
+        return self.by_id.get(pk)
+
+    def get_by_name(self, name):
+        return self.by_name.get(name.lower())
+
+    def filter(self, **attributes):
+        return tuple(
+            row for row in self.rows
+            if all(getattr(row, name) == value for name, value in attributes.items())
+        )
+
+
+class ReferenceSnapshot:
+    """
+    One version of all reference tables. Services and districts point to
+    their category and city in the same snapshot, so following those
+    relations never queries the database.
+    """
+
+    def __init__(self, version, tables, built_at):
+        self.version = version
+        self.built_at = built_at
+        for name, rows in tables.items():
+            setattr(self, name, ReferenceTable(rows))
+        self._entries = {}
+
+    @classmethod
+    def build(cls, version):
+        tables = {name: list(model.objects.order_by('pk')) for name, model in REFERENCE_TABLES.items()}
+        categories = {category.pk: category for category in tables['categories']}
+        cities = {city.pk: city for city in tables['cities']}
+        for service in tables['services']:
+            service.category = categories[service.category_id]
+        for district in tables['districts']:
+            if district.city_id is not None:
+                district.city = cities[district.city_id]
+        return cls(version, tables, int(time.time()))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_entries'] = {}
+        return state
+
+    def list_entry(self, name, serializer_class, **attributes):
+        """
+        Returns a conditional-GET cache entry (see `utils.conditional`) with
+        the serialized rows of a table, optionally filtered by attributes.
+        Entries are built once per process and snapshot version; their
+        Last-Modified is the snapshot's build time, so it is equal on all workers.
+        """
+        key = (name, serializer_class, tuple(sorted(attributes.items())))
+        entry = self._entries.get(key)
+        if entry is None:
+            table = getattr(self, name)
+            rows = table.filter(**attributes) if attributes else table.rows
+            entry = make_cache_entry(serializer_class(rows, many=True).data)
+            entry['last_modified'] = self.built_at
+            self._entries[key] = entry
+        return entry
+
+
+def _get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_reference_version():
+    """
+    Makes every process load a new snapshot on its next version check.
+    Called after a reference row is saved or deleted.
+    """
+    global _checked_at
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), timeout=None)
+    _checked_at = 0
+
+
+def get_reference_data():
+    """
+    Returns the current `ReferenceSnapshot`.
+
+    The snapshot lives in process memory. At most once per
+    REFERENCE_CACHE_CHECK_INTERVAL seconds the shared version in Redis is
+    read; when it changed, the snapshot of the new version is loaded from
+    Redis, or built from the database and stored there for other workers.
+    """
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < settings.REFERENCE_CACHE_CHECK_INTERVAL:
+        return snapshot
+
+    with _lock:
+        version = _get_version()
+        if _snapshot is None or _snapshot.version != version:
+            key = SNAPSHOT_KEY.format(version=version)
+            snapshot = cache.get(key)
+            if snapshot is None:
+                snapshot = ReferenceSnapshot.build(version)
+                cache.set(key, snapshot, timeout=settings.TIMEOUT)
+            _snapshot = snapshot
+        _checked_at = time.monotonic()
+        return _snapshot
@@ -0,0 +1,32 @@
+from rest_framework import serializers
+
+from core.reference_cache import REFERENCE_TABLES, get_reference_data
+
+
+class ReferencePrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for a reference table (see `core.reference_cache`)
+    that validates submitted ids against the in-memory snapshot instead of
+    running a query per id.
+
+    Args:
+        table (str): Snapshot table name, e.g. 'cities'.
+    """
+
+    def __init__(self, table, **kwargs):
+        self.table = table
+        if not kwargs.get('read_only'):
+            kwargs.setdefault('queryset', REFERENCE_TABLES[table].objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        instance = getattr(get_reference_data(), self.table).get(pk)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
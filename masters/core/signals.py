@@ -0,0 +1,75 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.db import transaction
+
+from .models.city_model import City, District
+from .models.education_model import Education
+from .models.language_model import Language
+from .models.statistics_model import PlatformStatistics
+from .reference_cache import bump_reference_version
+from users.models.master_model import Master
+from services.models.category_model import Category
+from reviews.models.review_models import Review
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=District)
+@receiver(post_delete, sender=District)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def refresh_reference_data(sender, **kwargs):
+    transaction.on_commit(bump_reference_version)
+
+
+@receiver(pre_save, sender=Master)
+def remember_previous_master_activity(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'is_active_on_main_page' not in update_fields:
+        # The flag is not written, e.g. by `update_last_login`, so it cannot change.
+        instance._was_active_on_main_page = instance.is_active_on_main_page
+        return
+    instance._was_active_on_main_page = bool(
+        instance.pk and Master.objects.filter(pk=instance.pk, is_active_on_main_page=True).exists()
+    )
+
+
+@receiver(post_save, sender=Master)
+def update_statistics_on_master_save(sender, instance, **kwargs):
+    was_active = getattr(instance, '_was_active_on_main_page', False)
+    if was_active != instance.is_active_on_main_page:
+        PlatformStatistics.objects.apply_delta(active_master_count=1 if instance.is_active_on_main_page else -1)
+
+
+@receiver(post_delete, sender=Master)
+def update_statistics_on_master_delete(sender, instance, **kwargs):
+    if instance.is_active_on_main_page:
+        PlatformStatistics.objects.apply_delta(active_master_count=-1)
+
+
+@receiver(post_save, sender=Category)
+def update_statistics_on_category_save(sender, created, **kwargs):
+    if created:
+        PlatformStatistics.objects.apply_delta(category_count=1)
+
+
+@receiver(post_delete, sender=Category)
+def update_statistics_on_category_delete(sender, **kwargs):
+    PlatformStatistics.objects.apply_delta(category_count=-1)
+
+
+@receiver(post_save, sender=Review)
+def update_statistics_on_review_save(sender, instance, created, **kwargs):
+    # `_previous_ratings` is stored by the rating summary pre_save receiver.
+    previous = getattr(instance, '_previous_ratings', None)
+    previous_rating = previous['rating'] if previous else 0
+    PlatformStatistics.objects.apply_delta(
+        rating_sum=instance.rating - previous_rating,
+        rating_count=1 if created else 0
+    )
+
+
+@receiver(post_delete, sender=Review)
+def update_statistics_on_review_delete(sender, instance, **kwargs):
+    PlatformStatistics.objects.apply_delta(rating_sum=-instance.rating, rating_count=-1)
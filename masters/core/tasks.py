@@ -0,0 +1,22 @@
+from celery import shared_task
+
+from core.models.statistics_model import PlatformStatistics
+from utils.platform_statistics import cache_platform_statistics
+
+
+@shared_task
+def refresh_platform_statistics():
+    """
+    Periodic task: recalculates the platform statistics from the source
+    tables and refreshes the cached response.
+    """
+    statistics = PlatformStatistics.objects.recalculate()
+    cache_platform_statistics(statistics)
+
+
+@shared_task
+def revalidate_platform_statistics():
+    """
+    Rebuilds a stale cached response from the precomputed record.
+    """
+    cache_platform_statistics()
@@ -1,3 +1,87 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.exceptions import ValidationError
+
+from core.models.city_model import City
+from core.models.statistics_model import PlatformStatistics
+from core.reference_cache import bump_reference_version
+from core.serializers.reference_fields import ReferencePrimaryKeyRelatedField
+from users.models import Master
+from utils.platform_statistics import REVALIDATE_LOCK_KEY, STATISTICS_KEY, get_platform_statistics
+
+
+class PlatformStatisticsTests(SimpleTestCase):
+    data = {'usta_sayi': '100+', 'xidmet_novu': 12, 'ortalama_reytinq': 4.6}
+
+    def setUp(self):
+        cache.set(STATISTICS_KEY, {'data': self.data, 'fresh_until': time.time() - 1}, timeout=None)
+        self.addCleanup(cache.delete_many, [STATISTICS_KEY, REVALIDATE_LOCK_KEY])
+
+    def test_stale_entry_schedules_one_revalidation(self):
+        with mock.patch('core.tasks.revalidate_platform_statistics.delay') as delay:
+            self.assertEqual(get_platform_statistics(), self.data)
+            self.assertEqual(get_platform_statistics(), self.data)
+        delay.assert_called_once_with()
+
+    def test_broker_errors_serve_the_stale_entry(self):
+        with mock.patch('core.tasks.revalidate_platform_statistics.delay', side_effect=OSError('Broker is down')):
+            self.assertEqual(get_platform_statistics(), self.data)
+        self.assertIsNone(cache.get(REVALIDATE_LOCK_KEY))
+
+
+class MasterActivityStatisticsTests(TestCase):
+    def setUp(self):
+        self.master = Master.objects.create(
+            full_name='Əli Məmmədov', phone_number='+994501234567', is_active_on_main_page=True
+        )
+
+    def active_master_count(self):
+        return PlatformStatistics.objects.get_solo().active_master_count
+
+    def test_saving_other_fields_skips_the_activity_lookup(self):
+        count = self.active_master_count()
+        with self.assertNumQueries(1):
+            self.master.save(update_fields=['last_login'])
+        self.assertEqual(self.active_master_count(), count)
+
+    def test_activity_changes_update_the_count(self):
+        count = self.active_master_count()
+        self.master.is_active_on_main_page = False
+        self.master.save(update_fields=['is_active_on_main_page'])
+        self.assertEqual(self.active_master_count(), count - 1)
+
+
+class ReferencePrimaryKeyRelatedFieldTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.city = City.objects.create(name='Bakı', display_name='Bakı')
+
+    def setUp(self):
+        # Reference changes bump the version on commit, which never happens inside a test.
+        bump_reference_version()
+        self.field = ReferencePrimaryKeyRelatedField('cities')
+
+    def assertFails(self, data, code):
+        with self.assertRaises(ValidationError) as context:
+            self.field.run_validation(data)
+        self.assertEqual(context.exception.get_codes(), [code])
+
+    def test_returns_the_snapshot_row_without_queries(self):
+        self.field.run_validation(self.city.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.field.run_validation(self.city.pk), self.city)
+            self.assertEqual(self.field.run_validation(str(self.city.pk)), self.city)
+
+    def test_unknown_id(self):
+        self.assertFails(self.city.pk + 1, 'does_not_exist')
+
+    def test_incorrect_types(self):
+        for data in ('Bakı', True, [self.city.pk], None):
+            with self.subTest(data=data):
+                self.assertFails(data, 'null' if data is None else 'incorrect_type')
+
+    def test_read_only_field_has_no_queryset(self):
+        self.assertIsNone(ReferencePrimaryKeyRelatedField('cities', read_only=True).queryset)
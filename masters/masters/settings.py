@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     #Third party apps
     'rest_framework',
@@ -139,6 +140,17 @@ CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND')
 CELERY_IGNORE_RESULT = True
 CELERY_TIMEZONE = 'UTC'
+# Run by the `celery-beat` service (celery -A masters beat); the workers do not schedule these.
+CELERY_BEAT_SCHEDULE = {
+    'refresh-platform-statistics': {
+        'task': 'core.tasks.refresh_platform_statistics',
+        'schedule': int(os.getenv('PLATFORM_STATISTICS_REFRESH_SECONDS', 900)),
+    },
+    'flush-search-index': {
+        'task': 'search.tasks.flush_search_index',
+        'schedule': 60,
+    },
+}
 
 #Redis settings
 REDIS_HOST = os.getenv('REDIS_HOST', 'redis')         
@@ -177,13 +189,62 @@ SIMPLE_JWT = {
 
 
 #Elasticsearch settings
+# One lazily created client per process (see search.client), shared by documents and search code.
 ELASTICSEARCH_DSL = {
     'default': {
         'hosts': os.getenv("ELASTICSEARCH_HOST"),
+        # Default per-request timeout, in seconds; latency-sensitive calls pass a shorter one.
+        'request_timeout': float(os.getenv('ELASTICSEARCH_REQUEST_TIMEOUT', 5)),
+        'max_retries': int(os.getenv('ELASTICSEARCH_MAX_RETRIES', 2)),
+        'retry_on_timeout': True,
+        # A node that failed is skipped for factor * 2 ** (failures - 1) seconds, up to the maximum.
+        'dead_node_backoff_factor': float(os.getenv('ELASTICSEARCH_BACKOFF_FACTOR', 1.0)),
+        'max_dead_node_backoff': float(os.getenv('ELASTICSEARCH_MAX_BACKOFF', 30.0)),
+        'connections_per_node': int(os.getenv('ELASTICSEARCH_CONNECTIONS_PER_NODE', 10)),
     }
 }
 
-ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST")
+ELASTICSEARCH_PING_TIMEOUT = float(os.getenv('ELASTICSEARCH_PING_TIMEOUT', 0.5))
+# How long the result of a health check is reused by every process.
+ELASTICSEARCH_HEALTH_CHECK_INTERVAL = int(os.getenv('ELASTICSEARCH_HEALTH_CHECK_INTERVAL', 10))
+# Indexing is done by search.indexing through Celery, not by the built-in signal processor.
+ELASTICSEARCH_DSL_AUTOSYNC = False
+# Changes to the same master within this window are sent to Elasticsearch once.
+SEARCH_INDEX_COALESCE_SECONDS = int(os.getenv('SEARCH_INDEX_COALESCE_SECONDS', 5))
+SEARCH_INDEX_BATCH_SIZE = int(os.getenv('SEARCH_INDEX_BATCH_SIZE', 500))
+# Masters updated per bulk request when a category, service, city or district changes.
+SEARCH_FAN_OUT_CHUNK_SIZE = int(os.getenv('SEARCH_FAN_OUT_CHUNK_SIZE', 500))
+# Search responses are cached per normalized parameter set until the index changes or this expires.
+SEARCH_RESULT_CACHE_TIMEOUT = int(os.getenv('SEARCH_RESULT_CACHE_TIMEOUT', 60))
+# Latency budgets of a search and an autocomplete request, in seconds.
+SEARCH_REQUEST_TIMEOUT = float(os.getenv('SEARCH_REQUEST_TIMEOUT', 2))
+SEARCH_SUGGEST_TIMEOUT = float(os.getenv('SEARCH_SUGGEST_TIMEOUT', 0.3))
+# Searches slower than this (ms, client round trip) go to the `search.slow` log with their
+# full body; with profiling on, a Celery task re-runs the body once per shape and minute
+# with `profile`.
+SEARCH_SLOW_QUERY_MS = int(os.getenv('SEARCH_SLOW_QUERY_MS', 500))
+SEARCH_SLOW_QUERY_PROFILE = os.getenv('SEARCH_SLOW_QUERY_PROFILE', 'False') == 'True'
+# Default order of searches without ?ordering=: weighted text relevance plus weighted
+# rating, review volume, profile completeness and recency boosts (see search.query_builder).
+SEARCH_RANKING = {
+    'enabled': os.getenv('SEARCH_RANKING_ENABLED', 'True') == 'True',
+    'text_weight': float(os.getenv('SEARCH_RANKING_TEXT_WEIGHT', 1.0)),
+    'rating_weight': float(os.getenv('SEARCH_RANKING_RATING_WEIGHT', 2.0)),
+    'review_count_weight': float(os.getenv('SEARCH_RANKING_REVIEW_COUNT_WEIGHT', 1.0)),
+    'completeness_weight': float(os.getenv('SEARCH_RANKING_COMPLETENESS_WEIGHT', 1.0)),
+    'recency_weight': float(os.getenv('SEARCH_RANKING_RECENCY_WEIGHT', 0.5)),
+    # Masters that joined this long ago get half of the recency boost.
+    'recency_scale': os.getenv('SEARCH_RANKING_RECENCY_SCALE', '180d'),
+}
+# 'auto' uses Elasticsearch and falls back to PostgreSQL while the circuit breaker is open;
+# 'postgres' forces the fallback, e.g. during a full reindex.
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+# The breaker opens after this many failed or slow Elasticsearch searches within the window
+# and stays open for SEARCH_CIRCUIT_RESET_SECONDS before one trial request is let through.
+SEARCH_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('SEARCH_CIRCUIT_FAILURE_THRESHOLD', 5))
+SEARCH_CIRCUIT_WINDOW_SECONDS = int(os.getenv('SEARCH_CIRCUIT_WINDOW_SECONDS', 60))
+SEARCH_CIRCUIT_LATENCY_THRESHOLD = float(os.getenv('SEARCH_CIRCUIT_LATENCY_THRESHOLD', 1.0))
+SEARCH_CIRCUIT_RESET_SECONDS = int(os.getenv('SEARCH_CIRCUIT_RESET_SECONDS', 30))
 
 #Caches settings
 CACHES = {
@@ -197,6 +258,18 @@ CACHES = {
 }
 
 TIMEOUT = int(os.getenv('TIMEOUT', 3600))
+MASTER_CACHE_TIMEOUT = int(os.getenv('MASTER_CACHE_TIMEOUT', 600))
+# How often each process compares its reference-data snapshot with the shared version, in seconds.
+REFERENCE_CACHE_CHECK_INTERVAL = int(os.getenv('REFERENCE_CACHE_CHECK_INTERVAL', 5))
+MASTER_BATCH_MAX_IDS = int(os.getenv('MASTER_BATCH_MAX_IDS', 50))
+# How long the cached landing page statistics are served without revalidation.
+PLATFORM_STATISTICS_FRESH_SECONDS = int(os.getenv('PLATFORM_STATISTICS_FRESH_SECONDS', 60))
+
+#Ranking settings
+# Bayesian prior for the top-rated list: a master's score starts at
+# RANKING_PRIOR_MEAN and moves towards their own average as reviews accumulate.
+RANKING_PRIOR_MEAN = float(os.getenv('RANKING_PRIOR_MEAN', 4.0))
+RANKING_PRIOR_WEIGHT = int(os.getenv('RANKING_PRIOR_WEIGHT', 10))
 
 # Swagger configuration
 SWAGGER_SETTINGS = {
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models.rating_summary_model import MasterRatingSummary
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds every master's rating summary from the reviews table.
+
+    Use it to repair drift after migrations, bulk imports or any
+    write that bypassed the review signals.
+
+    Usage:
+        python manage.py rebuild_rating_summaries --batch-size=1000
+    """
+
+    help = 'Rebuild denormalized rating summaries for all masters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=1000,
+            help='Number of summaries inserted per bulk query.',
+        )
+
+    def handle(self, *args, **options):
+        count = MasterRatingSummary.objects.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count} rating summaries rebuilt.'))
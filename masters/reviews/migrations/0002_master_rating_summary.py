@@ -0,0 +1,72 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+RATING_FIELDS = [
+    'rating', 'responsible', 'neat', 'time_management', 'communicative', 'punctual',
+    'professional', 'experienced', 'efficient', 'agile', 'patient'
+]
+
+
+def populate_rating_summaries(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    MasterRatingSummary = apps.get_model('reviews', 'MasterRatingSummary')
+
+    aggregates = {}
+    for field in RATING_FIELDS:
+        aggregates[f'{field}_sum'] = Sum(field)
+        aggregates[f'{field}_count'] = Count(field)
+
+    rows = Review.objects.values('master_id').annotate(**aggregates).order_by()
+    MasterRatingSummary.objects.bulk_create([
+        MasterRatingSummary(
+            master_id=row['master_id'],
+            **{key: row[key] or 0 for key in aggregates}
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MasterRatingSummary',
+            fields=[
+                ('master', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('responsible_sum', models.PositiveIntegerField(default=0)),
+                ('responsible_count', models.PositiveIntegerField(default=0)),
+                ('neat_sum', models.PositiveIntegerField(default=0)),
+                ('neat_count', models.PositiveIntegerField(default=0)),
+                ('time_management_sum', models.PositiveIntegerField(default=0)),
+                ('time_management_count', models.PositiveIntegerField(default=0)),
+                ('communicative_sum', models.PositiveIntegerField(default=0)),
+                ('communicative_count', models.PositiveIntegerField(default=0)),
+                ('punctual_sum', models.PositiveIntegerField(default=0)),
+                ('punctual_count', models.PositiveIntegerField(default=0)),
+                ('professional_sum', models.PositiveIntegerField(default=0)),
+                ('professional_count', models.PositiveIntegerField(default=0)),
+                ('experienced_sum', models.PositiveIntegerField(default=0)),
+                ('experienced_count', models.PositiveIntegerField(default=0)),
+                ('efficient_sum', models.PositiveIntegerField(default=0)),
+                ('efficient_count', models.PositiveIntegerField(default=0)),
+                ('agile_sum', models.PositiveIntegerField(default=0)),
+                ('agile_count', models.PositiveIntegerField(default=0)),
+                ('patient_sum', models.PositiveIntegerField(default=0)),
+                ('patient_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_rating_summaries, migrations.RunPython.noop),
+    ]
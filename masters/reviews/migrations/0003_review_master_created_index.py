@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_master_rating_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['master', 'created_at', 'id'], name='review_master_created_idx'),
+        ),
+    ]
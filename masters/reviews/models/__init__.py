@@ -0,0 +1,5 @@
+from .review_models import Review
+from .review_img_model import ReviewWorkImage
+from .rating_summary_model import MasterRatingSummary
+
+__all__ = ['Review', 'ReviewWorkImage', 'MasterRatingSummary']
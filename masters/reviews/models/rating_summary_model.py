@@ -0,0 +1,179 @@
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Sum, Count, Value, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from .review_models import Review
+from utils.constants import REVIEW_CRITERIA
+
+
+RATING_SUMMARY_FIELDS = ['rating'] + REVIEW_CRITERIA
+
+
+class MasterRatingSummaryManager(models.Manager):
+    """
+    Manager that keeps the denormalized rating summaries in sync with reviews.
+    """
+
+    def _aggregate_expressions(self):
+        expressions = {}
+        for field in RATING_SUMMARY_FIELDS:
+            expressions[f'{field}_sum'] = Sum(field)
+            expressions[f'{field}_count'] = Count(field)
+        return expressions
+
+    def _values_from_aggregate(self, row):
+        return {
+            key: row.get(key) or 0
+            for key in self._aggregate_expressions()
+        }
+
+    def ranking_score_expression(self):
+        """
+        Bayesian-weighted average of the overall rating:
+        (prior_weight * prior_mean + rating_sum) / (prior_weight + rating_count).
+        """
+        prior_weight = settings.RANKING_PRIOR_WEIGHT
+        prior_mean = settings.RANKING_PRIOR_MEAN
+        return (
+            Value(prior_weight * prior_mean, output_field=FloatField()) + Cast('rating_sum', FloatField())
+        ) / (
+            Value(float(prior_weight), output_field=FloatField()) + Cast('rating_count', FloatField())
+        )
+
+    def update_ranking_scores(self, masters):
+        """
+        Writes the stored ranking score of the given masters in a single UPDATE.
+        Masters without reviews are ranked last with a score of 0.
+
+        Args:
+            masters (QuerySet): Master queryset to update.
+        """
+        score = self.filter(
+            master_id=OuterRef('pk'),
+            rating_count__gt=0
+        ).annotate(score=self.ranking_score_expression()).values('score')[:1]
+        return masters.update(ranking_score=Coalesce(Subquery(score), Value(0.0)))
+
+    def _masters(self):
+        return self.model._meta.get_field('master').related_model.objects
+
+    def refresh_for_master(self, master_id):
+        """
+        Recalculates the summary of a single master from its reviews.
+        """
+        row = Review.objects.filter(master_id=master_id).aggregate(**self._aggregate_expressions())
+        values = self._values_from_aggregate(row)
+        summary, _ = self.update_or_create(master_id=master_id, defaults=values)
+        return summary
+
+    def apply_review_change(self, master_id, added=None, removed=None):
+        """
+        Applies the difference between an old and a new review state
+        to the master's summary using atomic F() updates.
+
+        Args:
+            master_id (int): The master the review belongs to.
+            added (dict, optional): Rating values that were written.
+            removed (dict, optional): Rating values that were replaced or deleted.
+        """
+        updates = {}
+        for field in RATING_SUMMARY_FIELDS:
+            sum_delta = 0
+            count_delta = 0
+            if added and added.get(field) is not None:
+                sum_delta += added[field]
+                count_delta += 1
+            if removed and removed.get(field) is not None:
+                sum_delta -= removed[field]
+                count_delta -= 1
+            if sum_delta:
+                updates[f'{field}_sum'] = F(f'{field}_sum') + sum_delta
+            if count_delta:
+                updates[f'{field}_count'] = F(f'{field}_count') + count_delta
+
+        if not updates:
+            return
+
+        if added is not None and not self.filter(master_id=master_id).exists():
+            # First summary for this master: build it from all of its reviews,
+            # which already include the review that has just been written.
+            self.refresh_for_master(master_id)
+        else:
+            self.filter(master_id=master_id).update(updated_at=timezone.now(), **updates)
+
+        if 'rating_sum' in updates or 'rating_count' in updates:
+            self.update_ranking_scores(self._masters().filter(pk=master_id))
+
+    def rebuild(self, batch_size=1000):
+        """
+        Rebuilds every summary from scratch with one grouped aggregate query
+        and recalculates every master's ranking score.
+
+        Returns:
+            int: Number of summaries written.
+        """
+        rows = Review.objects.values('master_id').annotate(**self._aggregate_expressions()).order_by()
+        summaries = [
+            self.model(master_id=row['master_id'], **self._values_from_aggregate(row))
+            for row in rows
+        ]
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(summaries, batch_size=batch_size)
+            self.update_ranking_scores(self._masters().all())
+        return len(summaries)
+
+
+class MasterRatingSummary(models.Model):
+    """
+    Per-master running sums and counts of review ratings.
+
+    Averages are derived from these columns, so reading a master's
+    full rating breakdown costs at most one query.
+    """
+    master = models.OneToOneField(
+        'users.Master',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_summary'
+    )
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    responsible_sum = models.PositiveIntegerField(default=0)
+    responsible_count = models.PositiveIntegerField(default=0)
+    neat_sum = models.PositiveIntegerField(default=0)
+    neat_count = models.PositiveIntegerField(default=0)
+    time_management_sum = models.PositiveIntegerField(default=0)
+    time_management_count = models.PositiveIntegerField(default=0)
+    communicative_sum = models.PositiveIntegerField(default=0)
+    communicative_count = models.PositiveIntegerField(default=0)
+    punctual_sum = models.PositiveIntegerField(default=0)
+    punctual_count = models.PositiveIntegerField(default=0)
+    professional_sum = models.PositiveIntegerField(default=0)
+    professional_count = models.PositiveIntegerField(default=0)
+    experienced_sum = models.PositiveIntegerField(default=0)
+    experienced_count = models.PositiveIntegerField(default=0)
+    efficient_sum = models.PositiveIntegerField(default=0)
+    efficient_count = models.PositiveIntegerField(default=0)
+    agile_sum = models.PositiveIntegerField(default=0)
+    agile_count = models.PositiveIntegerField(default=0)
+    patient_sum = models.PositiveIntegerField(default=0)
+    patient_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = MasterRatingSummaryManager()
+
+    def average(self, field):
+        """
+        Returns the rounded average of the given rating field,
+        or None if nobody has rated it yet.
+        """
+        count = getattr(self, f'{field}_count')
+        if not count:
+            return None
+        return round(getattr(self, f'{field}_sum') / count, 2)
+
+    def __str__(self):
+        return f'Rating summary for master {self.master_id}'
@@ -96,4 +96,10 @@ class Review(models.Model):
 
     class Meta:
         unique_together = ('master', 'user')
+        indexes = [
+            models.Index(
+                fields=['master', 'created_at', 'id'],
+                name='review_master_created_idx'
+            ),
+        ]
 
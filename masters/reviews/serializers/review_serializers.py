@@ -3,22 +3,34 @@ from django.core.validators import FileExtensionValidator
 
 from reviews.models.review_models import Review
 from reviews.models.review_img_model import ReviewWorkImage
+from reviews.serializers.review_img_serializer import ReviewImageSerializer
+from users.serializers.master_serializer import MasterCardSerializer
+from utils.dynamic_fields import DynamicFieldsMixin
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Review with its ratings. Supports `fields` and `expand` (see `DynamicFieldsMixin`).
+    """
     review_images = serializers.ListField(
         child=serializers.ImageField(
             validators=[FileExtensionValidator(allowed_extensions=['jpg', 'png'])]
         ),
         max_length=3,
         required=False,
-        allow_null=True
+        allow_null=True,
+        write_only=True
     )
     master = serializers.PrimaryKeyRelatedField(read_only=True)
+    images = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
     
     class Meta:
         model = Review
         exclude = ['user']
+        expandable_fields = {
+            'master': (MasterCardSerializer, {}),
+            'images': (ReviewImageSerializer, {'many': True}),
+        }
 
     def validate(self, data):
         required_fields = ['comment', 'rating']
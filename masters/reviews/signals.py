@@ -0,0 +1,64 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from users.models.master_model import Master
+from users.signals import invalidate_master_cache
+from .models.review_models import Review
+from .models.review_img_model import ReviewWorkImage
+from .models.rating_summary_model import MasterRatingSummary, RATING_SUMMARY_FIELDS
+
+
+def _rating_values(review):
+    return {field: getattr(review, field) for field in RATING_SUMMARY_FIELDS}
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_ratings(sender, instance, **kwargs):
+    """
+    Stores the ratings currently in the database so that post_save
+    can apply only the difference to the summary.
+    """
+    instance._previous_ratings = None
+    if instance.pk:
+        instance._previous_ratings = Review.objects.filter(pk=instance.pk).values(
+            'master_id', *RATING_SUMMARY_FIELDS
+        ).first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_summary_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_ratings', None)
+    current = _rating_values(instance)
+
+    if previous and previous['master_id'] != instance.master_id:
+        MasterRatingSummary.objects.apply_review_change(previous['master_id'], removed=previous)
+        previous = None
+
+    MasterRatingSummary.objects.apply_review_change(instance.master_id, added=current, removed=previous)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_summary_on_delete(sender, instance, origin=None, **kwargs):
+    # Reviews deleted together with their master need no update,
+    # the summary row is removed by the same cascade.
+    origin_model = getattr(origin, 'model', origin.__class__)
+    if origin_model is Master:
+        return
+    MasterRatingSummary.objects.apply_review_change(instance.master_id, removed=_rating_values(instance))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def clear_master_cache_on_review_change(sender, instance, **kwargs):
+    invalidate_master_cache(instance.master_id)
+    previous = getattr(instance, '_previous_ratings', None)
+    if previous and previous['master_id'] != instance.master_id:
+        invalidate_master_cache(previous['master_id'])
+
+
+@receiver(post_save, sender=ReviewWorkImage)
+@receiver(post_delete, sender=ReviewWorkImage)
+def clear_master_cache_on_review_image_change(sender, instance, **kwargs):
+    master_id = Review.objects.filter(pk=instance.review_id).values_list('master_id', flat=True).first()
+    if master_id:
+        invalidate_master_cache(master_id)
@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from reviews.models import Review
+from reviews.models.rating_summary_model import MasterRatingSummary, RATING_SUMMARY_FIELDS
+from reviews.models.review_img_model import ReviewWorkImage
+from reviews.serializers.review_serializers import ReviewSerializer
+from users.models import Master
+
+
+class ReviewSerializerQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.master = Master.objects.create(full_name='Əli Məmmədov', phone_number='+994501234567')
+        for number in range(3):
+            review = Review.objects.create(master=cls.master, user=f'user{number}', rating=5, comment='Əla iş')
+            for order in range(3):
+                ReviewWorkImage.objects.create(review=review, image=f'masters/reviews_images/{order}.jpg', order=order)
+
+    def serialize(self, **options):
+        queryset = ReviewSerializer.setup_queryset(Review.objects.filter(master=self.master), **options)
+        return ReviewSerializer(queryset, many=True, **options).data
+
+    def test_image_ids_are_prefetched(self):
+        with self.assertNumQueries(2):
+            data = self.serialize()
+        self.assertEqual([len(review['images']) for review in data], [3, 3, 3])
+
+    def test_expanded_images_are_prefetched(self):
+        with self.assertNumQueries(2):
+            data = self.serialize(expand=['images'])
+        self.assertEqual(len(data[0]['images']), 3)
+
+
+class RatingSummaryTests(TestCase):
+    def setUp(self):
+        self.master = Master.objects.create(full_name='Əli Məmmədov', phone_number='+994501234567')
+        self.other = Master.objects.create(full_name='Vüsal Quliyev', phone_number='+994501234568')
+
+    def summary(self, master):
+        return MasterRatingSummary.objects.get(master=master)
+
+    def assertMatchesRebuild(self, master):
+        """
+        The incrementally maintained sums and counts equal a rebuild from the reviews.
+        """
+        summary = self.summary(master)
+        rebuilt = MasterRatingSummary.objects.refresh_for_master(master.pk)
+        for field in RATING_SUMMARY_FIELDS:
+            self.assertEqual(getattr(summary, f'{field}_sum'), getattr(rebuilt, f'{field}_sum'), field)
+            self.assertEqual(getattr(summary, f'{field}_count'), getattr(rebuilt, f'{field}_count'), field)
+
+    def test_create_adds_the_ratings(self):
+        Review.objects.create(master=self.master, user='a', rating=5, comment='Əla', neat=4)
+        Review.objects.create(master=self.master, user='b', rating=3, comment='Pis deyil')
+        summary = self.summary(self.master)
+        self.assertEqual((summary.rating_sum, summary.rating_count), (8, 2))
+        self.assertEqual((summary.neat_sum, summary.neat_count), (4, 1))
+        self.assertMatchesRebuild(self.master)
+
+    def test_update_applies_the_difference(self):
+        review = Review.objects.create(master=self.master, user='a', rating=5, comment='Əla', neat=4)
+        Review.objects.create(master=self.master, user='b', rating=3, comment='Pis deyil')
+        review.rating = 2
+        review.neat = None
+        review.punctual = 5
+        review.save()
+        summary = self.summary(self.master)
+        self.assertEqual((summary.rating_sum, summary.rating_count), (5, 2))
+        self.assertEqual((summary.neat_sum, summary.neat_count), (0, 0))
+        self.assertEqual((summary.punctual_sum, summary.punctual_count), (5, 1))
+        self.assertMatchesRebuild(self.master)
+
+    def test_moving_a_review_updates_both_masters(self):
+        review = Review.objects.create(master=self.master, user='a', rating=5, comment='Əla')
+        Review.objects.create(master=self.other, user='b', rating=3, comment='Pis deyil')
+        review.master = self.other
+        review.save()
+        self.assertEqual(self.summary(self.master).rating_count, 0)
+        self.assertEqual((self.summary(self.other).rating_sum, self.summary(self.other).rating_count), (8, 2))
+        self.assertMatchesRebuild(self.master)
+        self.assertMatchesRebuild(self.other)
+
+    def test_delete_removes_the_ratings(self):
+        review = Review.objects.create(master=self.master, user='a', rating=5, comment='Əla', neat=4)
+        Review.objects.create(master=self.master, user='b', rating=3, comment='Pis deyil')
+        review.delete()
+        summary = self.summary(self.master)
+        self.assertEqual((summary.rating_sum, summary.rating_count), (3, 1))
+        self.assertEqual((summary.neat_sum, summary.neat_count), (0, 0))
+        self.assertMatchesRebuild(self.master)
+
+    def test_ranking_score_follows_the_ratings(self):
+        Review.objects.create(master=self.master, user='a', rating=5, comment='Əla')
+        self.master.refresh_from_db()
+        expected = MasterRatingSummary.objects.filter(master=self.master).annotate(
+            score=MasterRatingSummary.objects.ranking_score_expression()
+        ).get().score
+        self.assertAlmostEqual(self.master.ranking_score, expected)
+        self.assertGreater(self.master.ranking_score, 0)
+
+
+class ReviewCursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.master = Master.objects.create(
+            full_name='Əli Məmmədov', phone_number='+994501234567', is_active_on_main_page=True
+        )
+        cls.reviews = [
+            Review.objects.create(master=cls.master, user=f'user{number}', rating=5, comment='Əla iş')
+            for number in range(7)
+        ]
+        # Reviews written in the same instant must still keep a stable order.
+        created_at = timezone.now() - timedelta(days=1)
+        Review.objects.filter(pk__in=[review.pk for review in cls.reviews[2:5]]).update(created_at=created_at)
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertNotIn('count', data)
+            ids.extend(review['id'] for review in data['results'])
+            if not data['next']:
+                return ids
+            response = self.client.get(data['next'])
+
+    def expected_ids(self, *ordering):
+        return list(Review.objects.filter(master=self.master).order_by(*ordering).values_list('pk', flat=True))
+
+    def test_newest_first(self):
+        url = reverse('review_apis:master-reviews-list', args=[self.master.pk])
+        ids = self.walk(url, {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(ids, self.expected_ids('-created_at', '-id'))
+
+    def test_oldest_first(self):
+        url = reverse('review_apis:filter-reviews', args=[self.master.pk])
+        ids = self.walk(url, {'pagination': 'cursor', 'page_size': 2, 'order': 'oldest'})
+        self.assertEqual(ids, self.expected_ids('created_at', 'id'))
+
+    def test_new_reviews_do_not_shift_later_pages(self):
+        url = reverse('review_apis:master-reviews-list', args=[self.master.pk])
+        first_page = self.client.get(url, {'pagination': 'cursor', 'page_size': 3}).json()
+        Review.objects.create(master=self.master, user='late', rating=4, comment='Yaxşı')
+        cache.clear()
+        ids = [review['id'] for review in first_page['results']] + self.walk(first_page['next'], {})
+        self.assertEqual(ids, self.expected_ids('-created_at', '-id')[1:])
@@ -0,0 +1,52 @@
+from elasticsearch.dsl import analyzer, char_filter, token_filter
+from unidecode import unidecode
+
+
+# Azerbaijani letters and their closest ASCII spelling, as users type them
+# on keyboards without an Azerbaijani layout.
+AZ_FOLDING = {
+    'Ə': 'e', 'ə': 'e',
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ç': 'c', 'ç': 'c',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ö': 'o', 'ö': 'o',
+    'Ü': 'u', 'ü': 'u',
+}
+
+_AZ_FOLDING_TABLE = str.maketrans(AZ_FOLDING)
+
+az_folding = char_filter(
+    'az_folding',
+    type='mapping',
+    mappings=[f'{letter} => {folded}' for letter, folded in AZ_FOLDING.items()]
+)
+
+# Lowercases with Turkic rules (I => ı, İ => i).
+az_lowercase = token_filter('az_lowercase', type='lowercase', language='turkish')
+
+# Keeps the diacritics but lowercases with Turkic rules.
+az_text = analyzer(
+    'az_text',
+    tokenizer='standard',
+    filter=[az_lowercase]
+)
+
+# Diacritic-free form used by the `.folded` subfields and suggestions,
+# so "sehriyye" and "şəhriyyə" produce the same tokens.
+az_folded = analyzer(
+    'az_folded',
+    tokenizer='standard',
+    char_filter=[az_folding],
+    filter=['lowercase', 'asciifolding']
+)
+
+
+def transliterate(text):
+    """
+    Transliterates a query to ASCII for matching against the folded
+    subfields: Azerbaijani letters are folded like `az_folding` does
+    ("şəhriyyə" => "sehriyye"), anything else goes through unidecode
+    (Cyrillic "уста" => "usta").
+    """
+    return unidecode(text.translate(_AZ_FOLDING_TABLE))
@@ -0,0 +1,65 @@
+import logging
+import time
+
+from django.conf import settings
+from elasticsearch import ApiError, TransportError
+
+from search.backends.base import SearchBackend
+from search.backends.circuit_breaker import CircuitBreaker
+from search.backends.elasticsearch import ElasticsearchBackend
+from search.backends.postgres import PostgresBackend
+from search.client import is_healthy, mark_unhealthy
+
+logger = logging.getLogger(__name__)
+
+
+class FailoverSearchBackend(SearchBackend):
+    """
+    Searches Elasticsearch while it answers pings and its circuit breaker is
+    closed, and PostgreSQL otherwise. Connection errors, timeouts and 5xx responses are counted as
+    failures and answered from PostgreSQL; searches slower than
+    SEARCH_CIRCUIT_LATENCY_THRESHOLD are returned but also counted.
+    """
+    name = 'auto'
+
+    def __init__(self):
+        self.primary = ElasticsearchBackend()
+        self.fallback = PostgresBackend()
+        self.breaker = CircuitBreaker(self.primary.name)
+
+    def search(self, params, request):
+        if not is_healthy() or not self.breaker.allow_request():
+            return self.fallback.search(params, request)
+
+        started = time.monotonic()
+        try:
+            data = self.primary.search(params, request)
+        except (ApiError, TransportError) as e:
+            # 4xx errors come from the request itself and would fail on any backend.
+            if isinstance(e, ApiError) and e.meta.status < 500:
+                raise
+            logger.warning(f"Elasticsearch search failed, using PostgreSQL: {e}")
+            if not isinstance(e, ApiError):
+                mark_unhealthy()
+            self.breaker.record_failure()
+            return self.fallback.search(params, request)
+
+        if time.monotonic() - started > settings.SEARCH_CIRCUIT_LATENCY_THRESHOLD:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return data
+
+
+SEARCH_BACKENDS = {
+    'auto': FailoverSearchBackend,
+    'elasticsearch': ElasticsearchBackend,
+    'postgres': PostgresBackend,
+}
+
+
+def get_search_backend():
+    """
+    Returns the search backend selected by the SEARCH_BACKEND setting.
+    """
+    return SEARCH_BACKENDS[settings.SEARCH_BACKEND]()
@@ -0,0 +1,14 @@
+class SearchBackend:
+    """
+    Runs a master search and returns the paginated response data:
+    {'count', 'next', 'previous', 'results'} and, when supported, 'facets'.
+    """
+    name = None
+
+    def search(self, params, request):
+        """
+        Args:
+            params (dict): Parameters returned by `normalize_search_params`.
+            request: The DRF request, used for the paging parameters and links.
+        """
+        raise NotImplementedError
@@ -0,0 +1,62 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Cache-backed circuit breaker shared by all workers.
+
+    Failures (errors or calls slower than SEARCH_CIRCUIT_LATENCY_THRESHOLD)
+    are counted per SEARCH_CIRCUIT_WINDOW_SECONDS. Once
+    SEARCH_CIRCUIT_FAILURE_THRESHOLD is reached the circuit opens and
+    `allow_request` returns False for SEARCH_CIRCUIT_RESET_SECONDS. After that
+    a single trial request is let through per reset period: a success closes
+    the circuit, a failure opens it again.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.open_key = f'search:circuit:{name}:open'
+        self.tripped_key = f'search:circuit:{name}:tripped'
+        self.trial_key = f'search:circuit:{name}:trial'
+        self.failures_key = f'search:circuit:{name}:failures'
+
+    def is_open(self):
+        return bool(cache.get(self.open_key))
+
+    def allow_request(self):
+        if self.is_open():
+            return False
+        if cache.get(self.tripped_key):
+            # Half-open: only the worker that wins the trial key tries the backend.
+            return cache.add(self.trial_key, 1, timeout=settings.SEARCH_CIRCUIT_RESET_SECONDS)
+        return True
+
+    def record_success(self):
+        if cache.get(self.tripped_key):
+            cache.delete_many([self.tripped_key, self.trial_key, self.failures_key])
+            logger.info(f"Circuit '{self.name}' closed")
+
+    def record_failure(self):
+        if cache.get(self.tripped_key):
+            self._open()
+            return
+
+        cache.add(self.failures_key, 0, timeout=settings.SEARCH_CIRCUIT_WINDOW_SECONDS)
+        try:
+            failures = cache.incr(self.failures_key)
+        except ValueError:
+            cache.set(self.failures_key, 1, timeout=settings.SEARCH_CIRCUIT_WINDOW_SECONDS)
+            failures = 1
+        if failures >= settings.SEARCH_CIRCUIT_FAILURE_THRESHOLD:
+            self._open()
+
+    def _open(self):
+        cache.set(self.open_key, 1, timeout=settings.SEARCH_CIRCUIT_RESET_SECONDS)
+        cache.set(self.tripped_key, 1, timeout=None)
+        cache.delete_many([self.trial_key, self.failures_key])
+        logger.warning(f"Circuit '{self.name}' opened for {settings.SEARCH_CIRCUIT_RESET_SECONDS}s")
@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+
+from search.backends.base import SearchBackend
+from search.client import get_client
+from search.metrics import query_shape, record_search
+from search.pagination import SearchPagination
+from search.query_builder import build_master_search
+
+
+class ElasticsearchBackend(SearchBackend):
+    name = 'elasticsearch'
+    index = 'masters'
+
+    def search(self, params, request):
+        client = get_client().options(request_timeout=settings.SEARCH_REQUEST_TIMEOUT)
+        body = build_master_search(params)
+        pagination = SearchPagination()
+
+        started = time.monotonic()
+        data = pagination.paginate(client, self.index, body, request)
+        record_search(
+            query_shape(params, self.name, pagination.use_cursor(request)),
+            (time.monotonic() - started) * 1000,
+            data['count'],
+            took_ms=pagination.response.get('took'),
+            body=body,
+            index=self.index,
+        )
+        return data
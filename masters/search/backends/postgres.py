@@ -0,0 +1,108 @@
+import time
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+
+from search.analyzers import transliterate
+from search.backends.base import SearchBackend
+from search.documents import MasterDocument
+from search.metrics import query_shape, record_search
+from search.pagination import SearchPagination
+from search.query_builder import DISTANCE_ORDERING
+from search.search_vector import SEARCH_CONFIG
+from utils.geo import filter_nearby
+
+# Orderings accepted by the Elasticsearch search, mapped to model fields.
+ORDERING_FIELDS = {
+    'full_name': 'full_name',
+    'experience': 'experience',
+    'created_at': 'created_at',
+    'review_count': 'rating_summary__rating_count',
+}
+FILTER_LOOKUPS = {
+    'profession_category_id': 'profession_category_id',
+    'profession_service_id': 'profession_service_id',
+    'city_id': 'cities__id',
+    'district_id': 'districts__id',
+    'experience': 'experience',
+}
+
+
+class PostgresBackend(SearchBackend):
+    """
+    Fallback search on the `search_vector` column of masters, used while
+    Elasticsearch is unavailable or being reindexed.
+
+    It supports the same filters and returns the same document shape, with
+    a trigram match on the full name standing in for fuzzy matching. Only
+    page-number pagination is available and facets are not computed.
+    """
+    name = 'postgres'
+
+    def get_queryset(self):
+        return MasterDocument().get_queryset()
+
+    def filter_queryset(self, queryset, params):
+        filters = {lookup: params[name] for name, lookup in FILTER_LOOKUPS.items() if name in params}
+        queryset = queryset.filter(**filters)
+        if 'lat' in params:
+            queryset = filter_nearby(queryset, params['lat'], params['lon'], params['radius'])
+
+        text = params.get('search')
+        if not text:
+            return queryset.order_by('-ranking_score', 'pk')
+
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        folded = transliterate(text)
+        if folded != text:
+            query |= SearchQuery(folded, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.annotate(
+            rank=SearchRank(F('search_vector'), query) + TrigramSimilarity('full_name', text)
+        ).filter(
+            Q(search_vector=query) | Q(full_name__trigram_similar=text)
+        ).order_by('-rank', 'pk')
+
+    def order_queryset(self, queryset, ordering):
+        if ordering == DISTANCE_ORDERING:
+            return queryset.order_by('distance', 'pk')
+        descending = ordering.startswith('-')
+        field = ORDERING_FIELDS.get(ordering.lstrip('-').removesuffix('.keyword'))
+        if not field:
+            return queryset
+        return queryset.order_by(f'-{field}' if descending else field, 'pk')
+
+    def search(self, params, request):
+        pagination = SearchPagination()
+        # Cursors point into an Elasticsearch point-in-time and cannot be continued here.
+        if request.query_params.get(pagination.cursor_query_param):
+            raise ValidationError({'error': 'Kursorun vaxtı bitib, axtarışı yenidən başladın'})
+
+        queryset = self.filter_queryset(self.get_queryset(), params)
+        if 'ordering' in params:
+            queryset = self.order_queryset(queryset, params['ordering'])
+
+        page = pagination.get_page_number(request)
+        size = pagination.get_page_size(request)
+        offset = (page - 1) * size
+        started = time.monotonic()
+        count = queryset.count()
+        masters = list(queryset[offset:offset + size])
+        record_search(query_shape(params, self.name), (time.monotonic() - started) * 1000, count)
+        next_url, previous_url = pagination.get_page_links(request, page, offset + size < count)
+
+        document = MasterDocument()
+        results = []
+        for master in masters:
+            source = document.prepare(master)
+            source.pop('suggest', None)
+            if params.get('ordering') == DISTANCE_ORDERING:
+                source['distance_km'] = round(master.distance, 2)
+            results.append(source)
+
+        return {
+            'count': count,
+            'next': next_url,
+            'previous': previous_url,
+            'results': results,
+        }
@@ -0,0 +1,48 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from elasticsearch.dsl.connections import connections
+
+logger = logging.getLogger(__name__)
+
+HEALTH_KEY = 'search:elasticsearch:healthy'
+
+
+def get_client():
+    """
+    Returns the process-wide Elasticsearch client.
+
+    It is the `default` connection configured from ELASTICSEARCH_DSL, the same
+    one the documents use, created on first use so that importing search code
+    never touches the network. Each process (including every forked Celery
+    or Gunicorn worker) gets its own connection pool.
+    """
+    return connections.get_connection()
+
+
+def mark_unhealthy():
+    """
+    Records Elasticsearch as unreachable until the next health check is due,
+    so other requests and workers skip it without waiting for a timeout.
+    """
+    cache.set(HEALTH_KEY, False, timeout=settings.ELASTICSEARCH_HEALTH_CHECK_INTERVAL)
+
+
+def is_healthy():
+    """
+    Returns whether Elasticsearch answered its last ping.
+
+    The result is shared through the cache and refreshed at most once per
+    ELASTICSEARCH_HEALTH_CHECK_INTERVAL seconds, with a short ping timeout
+    and no retries.
+    """
+    healthy = cache.get(HEALTH_KEY)
+    if healthy is None:
+        healthy = get_client().options(
+            request_timeout=settings.ELASTICSEARCH_PING_TIMEOUT, max_retries=0
+        ).ping()
+        if not healthy:
+            logger.warning("Elasticsearch serverinə qoşulma uğursuz oldu!")
+        cache.set(HEALTH_KEY, healthy, timeout=settings.ELASTICSEARCH_HEALTH_CHECK_INTERVAL)
+    return healthy
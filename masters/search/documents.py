@@ -1,55 +1,58 @@
-import logging
 from django_elasticsearch_dsl import Document, fields, Index
 from django_elasticsearch_dsl.registries import registry
-from elasticsearch import Elasticsearch
-from django.conf import settings
 
 from services.models.category_model import Category
 from services.models.service_model import Service
 from core.models.city_model import City, District
 from users.models.master_model import Master
+from reviews.models.rating_summary_model import MasterRatingSummary
+from .analyzers import az_text, az_folded
 
-logger = logging.getLogger(__name__)
 
-# Elasticsearch client və bağlantı yoxlaması
-try:
-    es_client = Elasticsearch(hosts=[settings.ELASTICSEARCH_HOST])
-    if not es_client.ping():
-        logger.warning("Elasticsearch serverinə qoşulma uğursuz oldu!")
-        es_client = None
-except Exception as e:
-    logger.error(f"Elasticsearch bağlantısı zamanı xəta baş verdi: {e}")
-    es_client = None
+def az_text_field(**kwargs):
+    """
+    Text field analyzed with Azerbaijani lowercasing, with an ASCII-folded
+    `.folded` subfield for queries typed without diacritics.
+    """
+    subfields = {'folded': fields.TextField(analyzer=az_folded)}
+    subfields.update(kwargs.pop('fields', {}))
+    return fields.TextField(analyzer=az_text, fields=subfields, **kwargs)
 
 
 @registry.register_document
 class MasterDocument(Document):
+    full_name = az_text_field(fields={'keyword': fields.KeywordField()})
+    custom_profession = az_text_field()
+
     profession_category = fields.ObjectField(properties={
         'id': fields.IntegerField(),
-        'name': fields.TextField(),
-        'display_name': fields.TextField(),
+        'name': az_text_field(),
+        'display_name': az_text_field(),
     })
 
     profession_service = fields.ObjectField(properties={
         'id': fields.IntegerField(),
-        'name': fields.TextField(),
-        'display_name': fields.TextField(),
+        'name': az_text_field(),
+        'display_name': az_text_field(),
     })
 
     cities = fields.NestedField(properties={
         'id': fields.IntegerField(),
-        'name': fields.TextField(),
-        'display_name': fields.TextField(),
+        'name': az_text_field(),
+        'display_name': az_text_field(),
     })
 
     districts = fields.NestedField(properties={
         'id': fields.IntegerField(),
-        'name': fields.TextField(),
-        'display_name': fields.TextField(),
+        'name': az_text_field(),
+        'display_name': az_text_field(),
     })
 
     average_rating = fields.FloatField()
     review_count = fields.IntegerField()
+    profile_completeness = fields.FloatField()
+    location = fields.GeoPointField()
+    suggest = fields.CompletionField(analyzer=az_folded)
 
     class Index:
         name = 'masters'
@@ -61,8 +64,6 @@ class MasterDocument(Document):
     class Django:
         model = Master
         fields = [
-            'full_name',
-            'custom_profession',
             'education_detail',
             'birthday',
             'phone_number',
@@ -78,21 +79,21 @@ class MasterDocument(Document):
             'created_at',
             'slug',
         ]
-        related_models = [Category, Service, City, District]
-
-    def get_instances_from_related(self, related_instance):
-        try:
-            if isinstance(related_instance, Category):
-                return Master.objects.filter(profession_category=related_instance)
-            elif isinstance(related_instance, Service):
-                return Master.objects.filter(profession_service=related_instance)
-            elif isinstance(related_instance, City):
-                return Master.objects.filter(cities=related_instance)
-            elif isinstance(related_instance, District):
-                return Master.objects.filter(districts=related_instance)
-            return []
-        except Exception:
-            return []
+
+    def get_queryset(self):
+        """
+        Loads everything the prepare_* methods read in a fixed number of queries.
+        """
+        return super().get_queryset().select_related(
+            'profession_category', 'profession_service', 'rating_summary'
+        ).prefetch_related('cities', 'districts', 'languages')
+
+    def prepare_suggest(self, instance):
+        # Inactive masters are indexed for completeness but never suggested.
+        if not instance.is_active_on_main_page:
+            return None
+        inputs = [value for value in (instance.full_name, instance.custom_profession) if value]
+        return {'input': inputs, 'weight': 1 + int(instance.ranking_score * 5)}
 
     def prepare_average_rating(self, instance):
         return instance.average_rating() or None
@@ -100,6 +101,43 @@ class MasterDocument(Document):
     def prepare_review_count(self, instance):
         return instance.review_count or None
 
+    def prepare_location(self, instance):
+        if instance.latitude is None or instance.longitude is None:
+            return None
+        return {'lat': instance.latitude, 'lon': instance.longitude}
+
+    def prepare_profile_completeness(self, instance):
+        """
+        Share of the optional profile sections the master has filled in, from 0 to 1.
+        """
+        sections = [
+            instance.profile_picture,
+            instance.profession_service_id or instance.custom_profession,
+            instance.cities.all() or instance.districts.all(),
+            instance.education_id or instance.education_detail,
+            instance.languages.all(),
+            instance.experience is not None,
+            instance.note,
+            any((
+                instance.facebook_url, instance.instagram_url, instance.tiktok_url,
+                instance.linkedin_url, instance.youtube_url,
+            )),
+        ]
+        return round(sum(1 for section in sections if section) / len(sections), 2)
+
+    def get_rating_fields(self, master_ids):
+        """
+        Returns {master_id: {'average_rating', 'review_count'}} as prepared
+        for the full document, read from the rating summaries in one query.
+        """
+        ratings = {master_id: {'average_rating': None, 'review_count': None} for master_id in master_ids}
+        for summary in MasterRatingSummary.objects.filter(master_id__in=master_ids):
+            ratings[summary.master_id] = {
+                'average_rating': summary.average('rating') or None,
+                'review_count': summary.rating_count or None,
+            }
+        return ratings
+
     def prepare_profession_category(self, instance):
         if instance.profession_category:
             return {
@@ -140,3 +178,71 @@ class MasterDocument(Document):
             }
             for district in instance.districts.all()
         ]
+
+
+
+class SuggestDocument(Document):
+    """
+    Base for the small auxiliary indexes that only serve type-ahead suggestions.
+    """
+    display_name = az_text_field()
+    suggest = fields.CompletionField(analyzer=az_folded)
+
+    # Categories and services are ranked above locations, both above master names.
+    suggest_weight = 1
+
+    def prepare_suggest(self, instance):
+        inputs = list(dict.fromkeys(value for value in (instance.display_name, instance.name) if value))
+        return {'input': inputs, 'weight': self.suggest_weight}
+
+
+@registry.register_document
+class CategorySuggestDocument(SuggestDocument):
+    suggest_weight = 50
+
+    class Index:
+        name = 'suggest_categories'
+        settings = {'number_of_shards': 1, 'number_of_replicas': 0}
+
+    class Django:
+        model = Category
+        fields = ['name']
+
+
+@registry.register_document
+class ServiceSuggestDocument(SuggestDocument):
+    suggest_weight = 50
+
+    class Index:
+        name = 'suggest_services'
+        settings = {'number_of_shards': 1, 'number_of_replicas': 0}
+
+    class Django:
+        model = Service
+        fields = ['name']
+
+
+@registry.register_document
+class CitySuggestDocument(SuggestDocument):
+    suggest_weight = 40
+
+    class Index:
+        name = 'suggest_cities'
+        settings = {'number_of_shards': 1, 'number_of_replicas': 0}
+
+    class Django:
+        model = City
+        fields = ['name']
+
+
+@registry.register_document
+class DistrictSuggestDocument(SuggestDocument):
+    suggest_weight = 40
+
+    class Index:
+        name = 'suggest_districts'
+        settings = {'number_of_shards': 1, 'number_of_replicas': 0}
+
+    class Django:
+        model = District
+        fields = ['name']
@@ -0,0 +1,129 @@
+import logging
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from elasticsearch.helpers import bulk
+
+from search.indexing import record_reindex_changes
+from search.result_cache import bump_index_version
+from search.search_vector import update_search_vectors
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_KEY = 'search:fan_out:{model}:{pk}'
+PROGRESS_TIMEOUT = 60 * 60 * 24
+
+# Master lookup and document field for each model whose data is copied
+# into the master document; the nested fields hold a list of objects.
+RELATED_MASTER_LOOKUPS = {
+    'services.category': 'profession_category',
+    'services.service': 'profession_service',
+    'core.city': 'cities',
+    'core.district': 'districts',
+}
+NESTED_FIELDS = ('cities', 'districts')
+
+# Replaces the entry with the same id in a nested list, leaving the rest untouched.
+REPLACE_NESTED_SCRIPT = """
+def items = ctx._source[params.field];
+if (items == null) { ctx.op = 'noop'; return; }
+for (int i = 0; i < items.size(); i++) {
+    if (items[i].id == params.object.id) { items[i] = params.object; }
+}
+"""
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def get_fan_out_progress(model, pk):
+    """
+    Returns the progress of the last fan-out for a category, service, city
+    or district: {'status', 'total', 'done', 'last_id', 'started_at'}, or None.
+    """
+    return cache.get(PROGRESS_KEY.format(model=_label(model), pk=pk))
+
+
+def _document_object(instance):
+    return {'id': instance.pk, 'name': instance.name, 'display_name': instance.display_name}
+
+
+def _actions(document, field, master_ids, data):
+    for master_id in master_ids:
+        action = {'_op_type': 'update', '_index': document._index._name, '_id': master_id}
+        if field in NESTED_FIELDS:
+            action['script'] = {
+                'source': REPLACE_NESTED_SCRIPT,
+                'params': {'field': field, 'object': data},
+            }
+        else:
+            action['doc'] = {field: data}
+        yield action
+
+
+def fan_out_related_change(model, pk, resume=False, chunk_size=None):
+    """
+    Copies a changed category, service, city or district into the documents
+    of every master that references it.
+
+    Masters are walked in primary key order, `chunk_size` at a time. Each
+    chunk is one bulk request of partial updates that only touch the changed
+    object, and the masters' PostgreSQL search vectors are rebuilt with it.
+    The object is re-read for every chunk, so a later rename is never
+    overwritten by an older fan-out still in progress.
+
+    Progress is kept in the cache after every chunk. With `resume`, an
+    unfinished run continues after its last finished chunk instead of
+    starting over.
+
+    Returns:
+        int: Number of master documents updated.
+    """
+    from search.documents import MasterDocument
+
+    chunk_size = chunk_size or settings.SEARCH_FAN_OUT_CHUNK_SIZE
+    label = _label(model)
+    field = RELATED_MASTER_LOOKUPS[label]
+    progress_key = PROGRESS_KEY.format(model=label, pk=pk)
+    Master = apps.get_model('users', 'Master')
+    masters = Master.objects.filter(**{field: pk}).order_by('pk')
+
+    progress = cache.get(progress_key)
+    if not resume or not progress or progress['status'] != 'running':
+        progress = {'status': 'running', 'total': masters.count(), 'done': 0, 'last_id': 0, 'started_at': time.time()}
+        cache.set(progress_key, progress, timeout=PROGRESS_TIMEOUT)
+
+    document = MasterDocument()
+    client = document._get_connection()
+    updated = 0
+    while True:
+        instance = model.objects.filter(pk=pk).first()
+        if instance is None:
+            break
+        master_ids = list(masters.filter(pk__gt=progress['last_id']).values_list('pk', flat=True)[:chunk_size])
+        if not master_ids:
+            break
+        record_reindex_changes(master_ids)
+
+        success, errors = bulk(
+            client, _actions(document, field, master_ids, _document_object(instance)), raise_on_error=False
+        )
+        for error in errors:
+            # Masters not indexed yet get the new data with their first full index.
+            if error.get('update', {}).get('status') != 404:
+                logger.error(f"Error updating {field} of master document: {error}")
+        update_search_vectors(document.get_queryset().filter(pk__in=master_ids))
+
+        updated += success
+        progress.update(done=progress['done'] + len(master_ids), last_id=master_ids[-1])
+        cache.set(progress_key, progress, timeout=PROGRESS_TIMEOUT)
+
+    progress.update(status='done', finished_at=time.time())
+    cache.set(progress_key, progress, timeout=PROGRESS_TIMEOUT)
+    if updated:
+        bump_index_version()
+    logger.info(f"{label} {pk}: {updated} master documents updated")
+    return updated
@@ -0,0 +1,246 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_redis import get_redis_connection
+from elasticsearch.helpers import bulk
+
+from search.result_cache import bump_index_version
+from search.search_vector import update_search_vectors
+
+logger = logging.getLogger(__name__)
+
+PENDING_INDEX_KEY = 'search:pending:index'
+PENDING_DELETE_KEY = 'search:pending:delete'
+PENDING_RATINGS_KEY = 'search:pending:ratings'
+FLUSH_SCHEDULED_KEY = 'search:flush_scheduled'
+# While `reindex_masters` loads a new index, the ids of masters changed in the
+# meantime are collected here, to be replayed into the new index before and
+# after the alias swap.
+REINDEX_ACTIVE_KEY = 'search:reindex:active'
+REINDEX_CHANGED_KEY = 'search:reindex:changed'
+# Both keys expire unless the running command keeps refreshing them, so a
+# crashed run does not keep recording changes forever.
+REINDEX_CAPTURE_TIMEOUT = 60 * 30
+# Bulk item statuses worth retrying with the next flush. Any other failure,
+# e.g. a mapping error, would fail the same way again and is dropped.
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def _schedule_flush():
+    """
+    Schedules one flush per coalescing window; updates queued meanwhile
+    are picked up by the same flush.
+    """
+    countdown = settings.SEARCH_INDEX_COALESCE_SECONDS
+    if cache.add(FLUSH_SCHEDULED_KEY, 1, timeout=countdown * 10):
+        from search.tasks import flush_search_index
+        flush_search_index.apply_async(countdown=countdown)
+
+
+def _enqueue(add_key, remove_key, master_ids):
+    master_ids = [int(master_id) for master_id in master_ids]
+    if not master_ids:
+        return
+    pipeline = _redis().pipeline()
+    pipeline.sadd(add_key, *master_ids)
+    if remove_key:
+        pipeline.srem(remove_key, *master_ids)
+    pipeline.execute()
+    _schedule_flush()
+
+
+def queue_master_index(master_ids):
+    """
+    Queues masters to be re-indexed with their full document once the
+    current transaction commits. Repeated calls for the same master before
+    the next flush collapse into one index operation.
+    """
+    master_ids = list(master_ids)
+    transaction.on_commit(lambda: _enqueue(PENDING_INDEX_KEY, PENDING_DELETE_KEY, master_ids))
+
+
+def queue_master_delete(master_ids):
+    """
+    Queues masters to be removed from the index once the current transaction commits.
+    """
+    master_ids = list(master_ids)
+    transaction.on_commit(lambda: _enqueue(PENDING_DELETE_KEY, PENDING_INDEX_KEY, master_ids))
+
+
+def queue_master_rating_update(master_ids):
+    """
+    Queues a partial update of the rating fields of masters once the current
+    transaction commits. Any number of review changes to the same master
+    before the next flush result in one small `update` action.
+    """
+    master_ids = list(master_ids)
+    transaction.on_commit(lambda: _enqueue(PENDING_RATINGS_KEY, None, master_ids))
+
+
+def start_reindex_capture():
+    """
+    Starts collecting the ids of changed masters for a new `reindex_masters` run.
+    """
+    pipeline = _redis().pipeline()
+    pipeline.delete(REINDEX_CHANGED_KEY)
+    pipeline.set(REINDEX_ACTIVE_KEY, 1, ex=REINDEX_CAPTURE_TIMEOUT)
+    pipeline.execute()
+
+
+def refresh_reindex_capture():
+    """
+    Extends the capture started by `start_reindex_capture`.
+
+    Returns:
+        bool: False if the capture had already expired, in which case
+            changes made since then were not recorded.
+    """
+    pipeline = _redis().pipeline()
+    pipeline.expire(REINDEX_ACTIVE_KEY, REINDEX_CAPTURE_TIMEOUT)
+    pipeline.expire(REINDEX_CHANGED_KEY, REINDEX_CAPTURE_TIMEOUT)
+    return bool(pipeline.execute()[0])
+
+
+def stop_reindex_capture():
+    _redis().delete(REINDEX_ACTIVE_KEY)
+
+
+def record_reindex_changes(master_ids):
+    """
+    Records masters whose documents are being changed, if a reindex is running.
+    """
+    master_ids = [int(master_id) for master_id in master_ids]
+    if master_ids and _redis().exists(REINDEX_ACTIVE_KEY):
+        pipeline = _redis().pipeline()
+        pipeline.sadd(REINDEX_CHANGED_KEY, *master_ids)
+        pipeline.expire(REINDEX_CHANGED_KEY, REINDEX_CAPTURE_TIMEOUT)
+        pipeline.execute()
+
+
+def pop_reindex_changes(batch_size):
+    """
+    Returns and clears the ids recorded by `record_reindex_changes` so far.
+    """
+    return _pop_all(REINDEX_CHANGED_KEY, batch_size)
+
+
+def _pop_all(key, batch_size):
+    redis = _redis()
+    master_ids = []
+    while True:
+        batch = redis.spop(key, batch_size)
+        if not batch:
+            return master_ids
+        master_ids.extend(int(master_id) for master_id in batch)
+
+
+def _failed_ids(errors, op_type, ignored_status=None):
+    """
+    Returns the ids of failed bulk items worth retrying, and the ids that
+    failed with `ignored_status`. Other failures are logged and dropped.
+    """
+    retry_ids = []
+    ignored_ids = []
+    for error in errors:
+        item = error.get(op_type, {})
+        if item.get('status') == ignored_status:
+            ignored_ids.append(item['_id'])
+        elif item.get('status') in RETRYABLE_STATUSES:
+            retry_ids.append(item['_id'])
+        else:
+            logger.error(f"Error in master document {op_type}: {error}")
+    return retry_ids, ignored_ids
+
+
+def _update_ratings(document, master_ids):
+    """
+    Sends `update` actions carrying only the rating fields. Masters missing
+    from the index are queued for a full index instead.
+    """
+    ratings = document.get_rating_fields(master_ids)
+    actions = [
+        {'_op_type': 'update', '_index': document._index._name, '_id': master_id, 'doc': ratings[master_id]}
+        for master_id in master_ids
+    ]
+    success, errors = bulk(document._get_connection(), actions, raise_on_error=False)
+    retry_ids, missing = _failed_ids(errors, 'update', ignored_status=404)
+    if retry_ids:
+        _enqueue(PENDING_RATINGS_KEY, None, retry_ids)
+    if missing:
+        _enqueue(PENDING_INDEX_KEY, PENDING_DELETE_KEY, missing)
+    return success
+
+
+def flush_pending(batch_size=None):
+    """
+    Sends all queued index, rating update and delete operations to
+    Elasticsearch in bulk requests, updating the masters' PostgreSQL search
+    vectors on the way.
+
+    Ids are put back into their queue if a bulk request fails, so the
+    next flush retries them. Single documents that fail are only retried
+    when the failure is temporary (see RETRYABLE_STATUSES); the others are
+    logged and dropped, so they cannot hold back the rest of the queue.
+
+    Returns:
+        tuple: Number of indexed, rating-updated and deleted masters.
+    """
+    from search.documents import MasterDocument
+
+    batch_size = batch_size or settings.SEARCH_INDEX_BATCH_SIZE
+    index_ids = _pop_all(PENDING_INDEX_KEY, batch_size)
+    delete_ids = _pop_all(PENDING_DELETE_KEY, batch_size)
+    # Fully indexed or deleted masters need no separate rating update.
+    rating_ids = sorted(set(_pop_all(PENDING_RATINGS_KEY, batch_size)) - set(index_ids) - set(delete_ids))
+    record_reindex_changes(index_ids + rating_ids + delete_ids)
+    document = MasterDocument()
+    indexed = updated = deleted = 0
+
+    try:
+        for start in range(0, len(index_ids), batch_size):
+            chunk = index_ids[start:start + batch_size]
+            masters = list(document.get_queryset().filter(pk__in=chunk))
+            found = {master.pk for master in masters}
+            # Masters that vanished between queueing and flushing are deleted instead.
+            delete_ids.extend(set(chunk) - found)
+            # The PostgreSQL fallback search reads the same data, so it is refreshed first
+            # and stays current even while Elasticsearch is down.
+            update_search_vectors(masters)
+            success, errors = document.update(masters, raise_on_error=False)
+            indexed += success
+            retry_ids, _ = _failed_ids(errors, 'index')
+            if retry_ids:
+                _enqueue(PENDING_INDEX_KEY, PENDING_DELETE_KEY, retry_ids)
+
+        for start in range(0, len(rating_ids), batch_size):
+            updated += _update_ratings(document, rating_ids[start:start + batch_size])
+
+        for start in range(0, len(delete_ids), batch_size):
+            actions = [
+                {'_op_type': 'delete', '_index': document._index._name, '_id': master_id}
+                for master_id in delete_ids[start:start + batch_size]
+            ]
+            success, errors = bulk(document._get_connection(), actions, raise_on_error=False)
+            deleted += success
+            retry_ids, _ = _failed_ids(errors, 'delete', ignored_status=404)
+            if retry_ids:
+                _enqueue(PENDING_DELETE_KEY, PENDING_INDEX_KEY, retry_ids)
+    except Exception:
+        if index_ids:
+            _redis().sadd(PENDING_INDEX_KEY, *index_ids)
+        if delete_ids:
+            _redis().sadd(PENDING_DELETE_KEY, *delete_ids)
+        if rating_ids:
+            _redis().sadd(PENDING_RATINGS_KEY, *rating_ids)
+        raise
+
+    if indexed or updated or deleted:
+        bump_index_version()
+    return indexed, updated, deleted
+
@@ -0,0 +1,94 @@
+import json
+import math
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from search.client import get_client
+from search.query_builder import normalize_search_params, build_master_search
+
+
+class Command(BaseCommand):
+    """
+    Compares search rankings offline against a file of relevance judgments.
+
+    Every judged query is run against the masters index with plain text
+    relevance (baseline), with the current SEARCH_RANKING settings and,
+    if --weights is given, with those weights applied on top of the settings.
+    The report shows NDCG, MRR and precision over the first --k hits, i.e.
+    what a user sees on page one.
+
+    The judgments file is a JSON list of queries with graded master ids
+    (0 = not relevant, 3 = perfect):
+
+        [{"params": {"search": "santexnik", "city_id": 1}, "relevant": {"12": 3, "45": 1}}]
+
+    Usage:
+        python manage.py evaluate_search_ranking judgments.json
+        python manage.py evaluate_search_ranking judgments.json --k=10 --weights='{"rating_weight": 3}'
+    """
+
+    help = 'Compare search rankings against relevance judgments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('judgments', help='Path to the JSON judgments file.')
+        parser.add_argument('--k', type=int, default=10, help='Number of top hits to evaluate.')
+        parser.add_argument('--weights', help='JSON object of SEARCH_RANKING keys to try.')
+        parser.add_argument('--verbose-queries', dest='verbose_queries', action='store_true', help='Print metrics per query.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['judgments'], encoding='utf-8') as f:
+                judgments = json.load(f)
+            weights = json.loads(options['weights']) if options['weights'] else None
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read input: {e}')
+
+        rankings = {
+            'baseline': dict(settings.SEARCH_RANKING, enabled=False),
+            'current': dict(settings.SEARCH_RANKING, enabled=True),
+        }
+        if weights:
+            rankings['candidate'] = dict(settings.SEARCH_RANKING, enabled=True, **weights)
+
+        client = get_client()
+        k = options['k']
+        totals = {name: {'ndcg': 0.0, 'mrr': 0.0, 'precision': 0.0} for name in rankings}
+        for judgment in judgments:
+            params = normalize_search_params({key: str(value) for key, value in judgment['params'].items()})
+            params.pop('ordering', None)
+            grades = {int(master_id): grade for master_id, grade in judgment['relevant'].items()}
+            for name, ranking in rankings.items():
+                body = dict(build_master_search(params, ranking), size=k, _source=False)
+                hits = client.search(index='masters', body=body)['hits']['hits']
+                metrics = self._metrics([int(hit['_id']) for hit in hits], grades, k)
+                for metric, value in metrics.items():
+                    totals[name][metric] += value
+                if options['verbose_queries']:
+                    self.stdout.write(f"{json.dumps(judgment['params'], ensure_ascii=False)} [{name}] {self._format(metrics)}")
+
+        count = max(len(judgments), 1)
+        self.stdout.write(f'{len(judgments)} queries, top {k} hits:')
+        for name, metrics in totals.items():
+            averages = {metric: value / count for metric, value in metrics.items()}
+            self.stdout.write(f'  {name:<10} {self._format(averages)}')
+
+    def _metrics(self, ranked_ids, grades, k):
+        dcg = sum(
+            (2 ** grades.get(master_id, 0) - 1) / math.log2(position + 2)
+            for position, master_id in enumerate(ranked_ids[:k])
+        )
+        ideal = sorted(grades.values(), reverse=True)[:k]
+        idcg = sum((2 ** grade - 1) / math.log2(position + 2) for position, grade in enumerate(ideal))
+        first_relevant = next(
+            (position for position, master_id in enumerate(ranked_ids[:k]) if grades.get(master_id, 0) > 0),
+            None
+        )
+        return {
+            'ndcg': dcg / idcg if idcg else 0.0,
+            'mrr': 1 / (first_relevant + 1) if first_relevant is not None else 0.0,
+            'precision': sum(1 for master_id in ranked_ids[:k] if grades.get(master_id, 0) > 0) / k,
+        }
+
+    def _format(self, metrics):
+        return '  '.join(f'{metric}={value:.3f}' for metric, value in metrics.items())
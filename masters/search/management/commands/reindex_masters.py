@@ -0,0 +1,197 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from elasticsearch.helpers import bulk, parallel_bulk
+
+from search.documents import MasterDocument
+from search.indexing import (
+    pop_reindex_changes, refresh_reindex_capture, start_reindex_capture, stop_reindex_capture
+)
+from search.result_cache import bump_index_version
+
+
+CHECKPOINT_KEY = 'search:reindex_masters:checkpoint'
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the masters index without downtime.
+
+    Documents are loaded into a new versioned index (e.g. masters-20250101120000)
+    while searches keep using the current one. Masters are streamed with a
+    server-side cursor, prefetched in chunks, and sent with parallel bulk
+    requests while refresh is disabled. When the load is complete, the
+    `masters` alias is moved to the new index in one atomic request and the
+    previous indices are deleted.
+
+    Masters changed while the new index loads are only written to the
+    current one, so their ids are recorded (see `search.indexing`) and
+    re-indexed into the new index right before the alias swap, and once more
+    right after it for changes that arrived in between.
+
+    Progress is saved to the cache after every chunk. An interrupted run can
+    continue where it stopped with --resume, within the time changes keep
+    being recorded (REINDEX_CAPTURE_TIMEOUT); after that it has to start over.
+
+    Usage:
+        python manage.py reindex_masters --chunk-size=1000 --threads=4
+        python manage.py reindex_masters --resume
+    """
+
+    help = 'Rebuild the masters Elasticsearch index into a new index and swap the alias'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', dest='chunk_size', type=int, default=1000,
+            help='Masters fetched per database round-trip and saved per checkpoint.',
+        )
+        parser.add_argument(
+            '--bulk-size', dest='bulk_size', type=int, default=500,
+            help='Documents per bulk request.',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Number of parallel bulk requests.',
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Continue the last interrupted run from its checkpoint.',
+        )
+        parser.add_argument(
+            '--keep-old', dest='keep_old', action='store_true',
+            help='Do not delete the previous indices after the alias swap.',
+        )
+
+    def handle(self, *args, **options):
+        document = MasterDocument()
+        client = document._get_connection()
+        alias = document._index._name
+
+        checkpoint = cache.get(CHECKPOINT_KEY) if options['resume'] else None
+        if options['resume'] and checkpoint is None:
+            raise CommandError('No checkpoint to resume from.')
+
+        if checkpoint:
+            index_name = checkpoint['index']
+            self._refresh_capture()
+            self.stdout.write(f"Resuming {index_name} after master {checkpoint['last_id']}.")
+        else:
+            index_name = f"{alias}-{time.strftime('%Y%m%d%H%M%S')}"
+            start_reindex_capture()
+            index = document._index.clone(name=index_name)
+            index.settings(refresh_interval='-1', number_of_replicas=0)
+            index.create(using=client)
+            checkpoint = {'index': index_name, 'last_id': 0, 'indexed': 0}
+            cache.set(CHECKPOINT_KEY, checkpoint, timeout=None)
+            self.stdout.write(f'Created index {index_name}.')
+
+        self._load(document, client, checkpoint, options)
+        self._refresh_capture()
+        self._replay_changes(document, client, index_name, options['bulk_size'])
+        self._finish(document, client, alias, index_name, options['keep_old'])
+        stop_reindex_capture()
+        self._replay_changes(document, client, index_name, options['bulk_size'])
+        cache.delete(CHECKPOINT_KEY)
+
+    def _actions(self, document, queryset, index_name):
+        for master in queryset:
+            action = document._prepare_action(master, 'index')
+            action['_index'] = index_name
+            yield action
+
+    def _load(self, document, client, checkpoint, options):
+        chunk_size = options['chunk_size']
+        queryset = document.get_queryset().filter(
+            pk__gt=checkpoint['last_id']
+        ).order_by('pk').iterator(chunk_size=chunk_size)
+
+        started = time.monotonic()
+        previously_indexed = checkpoint['indexed']
+        indexed = 0
+        results = parallel_bulk(
+            client,
+            self._actions(document, queryset, checkpoint['index']),
+            thread_count=options['threads'],
+            chunk_size=options['bulk_size'],
+        )
+        # parallel_bulk yields results in the order of the actions, so the
+        # last acknowledged id is a safe point to resume from.
+        for ok, info in results:
+            if not ok:
+                raise CommandError(f'Indexing failed: {info}')
+            indexed += 1
+            if indexed % chunk_size == 0:
+                self._save_checkpoint(checkpoint, info, previously_indexed + indexed)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{checkpoint['indexed']} masters indexed ({indexed / elapsed:.0f} docs/s)"
+                )
+        if indexed % chunk_size:
+            self._save_checkpoint(checkpoint, info, previously_indexed + indexed)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"Loaded {indexed} masters in {elapsed:.1f}s "
+            f"({indexed / elapsed if elapsed else 0:.0f} docs/s), {checkpoint['indexed']} in total."
+        )
+
+    def _replay_changes(self, document, client, index_name, batch_size):
+        """
+        Re-indexes the masters changed since the load started into the new
+        index, and deletes the ones that no longer exist.
+        """
+        master_ids = pop_reindex_changes(batch_size)
+        for start in range(0, len(master_ids), batch_size):
+            chunk = master_ids[start:start + batch_size]
+            masters = list(document.get_queryset().filter(pk__in=chunk))
+            actions = list(self._actions(document, masters, index_name))
+            actions += [
+                {'_op_type': 'delete', '_index': index_name, '_id': master_id}
+                for master_id in set(chunk) - {master.pk for master in masters}
+            ]
+            _, errors = bulk(client, actions, raise_on_error=False)
+            for error in errors:
+                if error.get('delete', {}).get('status') != 404:
+                    raise CommandError(f'Replaying changes failed: {error}')
+        if master_ids:
+            self.stdout.write(f'Replayed {len(master_ids)} masters changed during the load.')
+
+    def _save_checkpoint(self, checkpoint, info, total_indexed):
+        checkpoint['indexed'] = total_indexed
+        checkpoint['last_id'] = int(info['index']['_id'])
+        cache.set(CHECKPOINT_KEY, checkpoint, timeout=None)
+        self._refresh_capture()
+
+    def _refresh_capture(self):
+        if not refresh_reindex_capture():
+            raise CommandError(
+                'Masters changed while the run was stopped were not recorded. Start a new run without --resume.'
+            )
+
+    def _finish(self, document, client, alias, index_name, keep_old):
+        replicas = document._index._settings.get('number_of_replicas', 1)
+        client.indices.put_settings(
+            index=index_name,
+            settings={'index': {'refresh_interval': None, 'number_of_replicas': replicas}}
+        )
+        client.indices.refresh(index=index_name)
+
+        actions = []
+        old_indices = []
+        if client.indices.exists_alias(name=alias):
+            old_indices = list(client.indices.get_alias(name=alias).keys())
+            actions += [{'remove': {'index': old, 'alias': alias}} for old in old_indices]
+        elif client.indices.exists(index=alias):
+            # First run: `masters` is still a concrete index and has to make room for the alias.
+            actions.append({'remove_index': {'index': alias}})
+        actions.append({'add': {'index': index_name, 'alias': alias}})
+        client.indices.update_aliases(actions=actions)
+        bump_index_version()
+        self.stdout.write(self.style.SUCCESS(f'Alias {alias} now points to {index_name}.'))
+
+        if not keep_old:
+            for old in old_indices:
+                if old != index_name:
+                    client.indices.delete(index=old)
+                    self.stdout.write(f'Deleted index {old}.')
@@ -0,0 +1,174 @@
+import json
+import logging
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger('search.slow')
+
+SHAPES_KEY = 'search:metrics:shapes'
+# Hash of the counters and latency buckets of one shape.
+SHAPE_KEY = 'search:metrics:shape:{shape}'
+# Sorted set of the maximum round trip of every shape.
+MAX_ROUND_TRIP_KEY = 'search:metrics:max_round_trip_ms'
+PROFILE_LOCK_KEY = 'search:metrics:profiled:{shape}'
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open ended.
+LATENCY_BUCKETS = (25, 50, 100, 250, 500, 1000, 2500)
+COUNTERS = ('count', 'slow', 'took_ms', 'round_trip_ms', 'hits')
+# The ordering changes how a query runs, so its value is part of the shape. Only these
+# sort keys are kept; any other value is recorded as "other", so that clients cannot
+# create an unbounded number of shapes.
+SHAPE_ORDERINGS = ('distance', 'full_name', 'experience', 'created_at', 'average_rating', 'review_count')
+
+
+def _shape_ordering(ordering):
+    descending = ordering.startswith('-')
+    field = ordering.lstrip('-').removesuffix('.keyword')
+    if field not in SHAPE_ORDERINGS:
+        return 'other'
+    return f'-{field}' if descending else field
+
+
+def query_shape(params, backend, cursor=False):
+    """
+    Describes the structure of a search without its values, e.g.
+    "elasticsearch:city_id+search|ordering=distance|cursor", so that the
+    same combination of filters from different users is aggregated together.
+    """
+    names = sorted(name for name in params if name != 'ordering')
+    shape = f"{backend}:{'+'.join(names) or 'all'}"
+    if 'ordering' in params:
+        shape += f"|ordering={_shape_ordering(params['ordering'])}"
+    if cursor:
+        shape += '|cursor'
+    return shape
+
+
+def _bucket(milliseconds):
+    for bound in LATENCY_BUCKETS:
+        if milliseconds < bound:
+            return f'lt_{bound}'
+    return f'gte_{LATENCY_BUCKETS[-1]}'
+
+
+def _redis():
+    return get_redis_connection('default')
+
+
+def record_search(shape, round_trip_ms, hits, took_ms=None, body=None, index=None):
+    """
+    Records one search that reached the backend.
+
+    The latency counters of its query shape are updated in a single
+    pipelined Redis round trip, and searches slower than
+    SEARCH_SLOW_QUERY_MS are written to the `search.slow` log with their
+    full body. With SEARCH_SLOW_QUERY_PROFILE enabled and an index given,
+    the body is run once more with `profile` in a Celery task (at most once
+    per shape and minute), which logs the profile too.
+
+    Args:
+        shape (str): Query shape from `query_shape`.
+        round_trip_ms (float): Time spent waiting for the backend, in milliseconds.
+        hits (int): Total number of hits.
+        took_ms (int): Time Elasticsearch reports for the search, if any.
+    """
+    round_trip_ms = int(round_trip_ms)
+    slow = round_trip_ms >= settings.SEARCH_SLOW_QUERY_MS
+    profile = slow and settings.SEARCH_SLOW_QUERY_PROFILE and index is not None and body is not None
+    logger.debug(f"search shape={shape} took={took_ms}ms round_trip={round_trip_ms}ms hits={hits}")
+
+    # Metrics are best effort: a Redis or broker outage must not fail the search.
+    key = SHAPE_KEY.format(shape=shape)
+    pipeline = _redis().pipeline(transaction=False)
+    pipeline.sadd(SHAPES_KEY, shape)
+    for name, delta in (
+        ('count', 1), ('slow', int(slow)), ('took_ms', took_ms or 0),
+        ('round_trip_ms', round_trip_ms), ('hits', hits), (_bucket(round_trip_ms), 1),
+    ):
+        if delta:
+            pipeline.hincrby(key, name, delta)
+    pipeline.zadd(MAX_ROUND_TRIP_KEY, {shape: round_trip_ms}, gt=True)
+    if profile:
+        pipeline.set(PROFILE_LOCK_KEY.format(shape=shape), 1, nx=True, ex=60)
+    try:
+        results = pipeline.execute()
+    except Exception as e:
+        logger.warning(f"Could not record search metrics: {e}")
+        results = None
+
+    if not slow:
+        return
+    entry = {'shape': shape, 'took_ms': took_ms, 'round_trip_ms': round_trip_ms, 'hits': hits, 'body': body}
+    slow_logger.warning(json.dumps(entry, ensure_ascii=False, default=str))
+    if profile and results and results[-1]:
+        from search.tasks import profile_slow_search
+        try:
+            profile_slow_search.delay(shape, index, body)
+        except Exception as e:
+            logger.warning(f"Could not schedule search profiling: {e}")
+
+
+def log_search_profile(shape, index, body):
+    """
+    Runs a search body again with `profile` and writes the profile to the `search.slow` log.
+    """
+    from search.client import get_client
+
+    entry = {'shape': shape}
+    try:
+        entry['profile'] = get_client().search(index=index, body=dict(body, profile=True))['profile']
+    except Exception as e:
+        entry['profile_error'] = str(e)
+    slow_logger.warning(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+def _percentile(buckets, count, fraction):
+    """
+    Returns the upper bound of the bucket holding the given fraction of requests.
+    """
+    seen = 0
+    for bound in LATENCY_BUCKETS:
+        seen += buckets.get(f'lt_{bound}', 0)
+        if seen >= count * fraction:
+            return bound
+    return None
+
+
+def get_search_metrics():
+    """
+    Returns the aggregated latency of every query shape seen, slowest average first:
+    count, slow count, average took and round trip, p50/p95 bucket upper
+    bounds (None above the last bucket), maximum round trip and average hit count.
+    """
+    bucket_names = [f'lt_{bound}' for bound in LATENCY_BUCKETS] + [f'gte_{LATENCY_BUCKETS[-1]}']
+    redis = _redis()
+    shape_names = sorted(shape.decode() for shape in redis.smembers(SHAPES_KEY))
+    pipeline = redis.pipeline(transaction=False)
+    for shape in shape_names:
+        pipeline.hgetall(SHAPE_KEY.format(shape=shape))
+        pipeline.zscore(MAX_ROUND_TRIP_KEY, shape)
+    values = pipeline.execute()
+    shapes = []
+    for shape, stored, max_round_trip_ms in zip(shape_names, values[::2], values[1::2]):
+        stored = {name.decode(): int(value) for name, value in stored.items()}
+        counters = {name: stored.get(name, 0) for name in COUNTERS + tuple(bucket_names)}
+        counters['max_round_trip_ms'] = int(max_round_trip_ms or 0)
+        count = counters['count']
+        if not count:
+            continue
+        buckets = {name: counters[name] for name in bucket_names}
+        shapes.append({
+            'shape': shape,
+            'count': count,
+            'slow': counters['slow'],
+            'avg_took_ms': round(counters['took_ms'] / count, 1),
+            'avg_round_trip_ms': round(counters['round_trip_ms'] / count, 1),
+            'p50_round_trip_ms': _percentile(buckets, count, 0.5),
+            'p95_round_trip_ms': _percentile(buckets, count, 0.95),
+            'max_round_trip_ms': counters['max_round_trip_ms'],
+            'avg_hits': round(counters['hits'] / count, 1),
+            'latency_buckets': buckets,
+        })
+    shapes.sort(key=lambda item: item['avg_round_trip_ms'], reverse=True)
+    return {'slow_threshold_ms': settings.SEARCH_SLOW_QUERY_MS, 'shapes': shapes}
@@ -0,0 +1,191 @@
+import base64
+import binascii
+import json
+
+from elasticsearch import ApiError, BadRequestError, NotFoundError, TransportError
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+from search.query_builder import parse_facets
+
+
+class SearchPagination:
+    """
+    Paginates Elasticsearch queries on the cluster instead of in Python.
+
+    Shallow pages use `from`/`size` with `?page=`. Deep scrolling uses an opaque
+    `?cursor=` holding a point-in-time id and the `search_after` sort values
+    of the last hit, so every page costs the same no matter how deep it is.
+    Send `?pagination=cursor` to get the first cursor page. The point-in-time
+    is closed once the last page is served or the cursor fails; abandoned
+    cursors expire after the short keep-alive.
+
+    The `count` is the real number of hits, counted with `track_total_hits`.
+    When the body has facet aggregations, their counts are added under `facets`.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    page_query_param = 'page'
+    cursor_query_param = 'cursor'
+    # Elasticsearch refuses from + size beyond index.max_result_window.
+    max_result_window = 10000
+    point_in_time_keep_alive = '1m'
+    response = None
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_page_number(self, request):
+        try:
+            return max(1, int(request.query_params.get(self.page_query_param, 1)))
+        except ValueError:
+            return 1
+
+    def encode_cursor(self, pit_id, search_after):
+        data = json.dumps({'pit': pit_id, 'after': search_after}).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return data['pit'], data['after']
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise ValidationError({'error': 'Kursor səhvdir'})
+
+    def close_point_in_time(self, client, pit_id):
+        try:
+            client.close_point_in_time(id=pit_id)
+        except (ApiError, TransportError):
+            # It expires after its keep-alive anyway.
+            pass
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get('pagination') == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def get_results(self, response, body):
+        """
+        Returns the sources of the hits, with `distance_km` added when the
+        hits are sorted by distance.
+        """
+        sort = body.get('sort') or []
+        by_distance = bool(sort) and isinstance(sort[0], dict) and '_geo_distance' in sort[0]
+        results = []
+        for hit in response['hits']['hits']:
+            source = hit['_source']
+            if by_distance:
+                source = dict(source, distance_km=round(hit['sort'][0], 2))
+            results.append(source)
+        return results
+
+    def get_page_links(self, request, page, has_next):
+        """
+        Returns the `next` and `previous` URLs of a page-number page.
+        """
+        url = request.build_absolute_uri()
+        next_url = None
+        if has_next:
+            next_url = replace_query_param(url, self.page_query_param, page + 1)
+        previous_url = None
+        if page > 1:
+            previous_url = replace_query_param(url, self.page_query_param, page - 1)
+            if page == 2:
+                previous_url = remove_query_param(previous_url, self.page_query_param)
+        return next_url, previous_url
+
+    def paginate(self, client, index, body, request):
+        """
+        Runs the search for the requested page and returns the response data:
+        {'count', 'next', 'previous', 'results'}.
+
+        Args:
+            client: Elasticsearch client.
+            index (str): Index or alias to search.
+            body (dict): Search body with `query` and optionally `sort`.
+            request: The DRF request, used for the page parameters and links.
+        """
+        body = dict(body, size=self.get_page_size(request), track_total_hits=True)
+        if self.use_cursor(request):
+            data, response = self._paginate_cursor(client, index, body, request)
+        else:
+            data, response = self._paginate_page(client, index, body, request)
+        if 'aggregations' in response:
+            data['facets'] = parse_facets(response['aggregations'])
+        # Kept for instrumentation, e.g. the `took` time.
+        self.response = response
+        return data
+
+    def _paginate_page(self, client, index, body, request):
+        page = self.get_page_number(request)
+        size = body['size']
+        offset = (page - 1) * size
+        if offset + size > self.max_result_window:
+            raise ValidationError({
+                'error': f'{self.max_result_window} nəticədən sonrakı səhifələr üçün pagination=cursor istifadə edin'
+            })
+
+        response = client.search(index=index, body=dict(body, **{'from': offset}))
+        count = response['hits']['total']['value']
+        next_url, previous_url = self.get_page_links(
+            request, page, offset + size < min(count, self.max_result_window)
+        )
+
+        return {
+            'count': count,
+            'next': next_url,
+            'previous': previous_url,
+            'results': self.get_results(response, body),
+        }, response
+
+    def _paginate_cursor(self, client, index, body, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            pit_id, search_after = self.decode_cursor(cursor)
+            body['search_after'] = search_after
+        else:
+            pit_id = client.open_point_in_time(
+                index=index, keep_alive=self.point_in_time_keep_alive
+            )['id']
+
+        # Searches against a point-in-time must not name an index. `_shard_doc`
+        # breaks ties so that search_after never skips or repeats a hit.
+        body['pit'] = {'id': pit_id, 'keep_alive': self.point_in_time_keep_alive}
+        body['sort'] = list(body.get('sort') or ['_score']) + [{'_shard_doc': 'asc'}]
+
+        try:
+            response = client.search(body=body)
+        except NotFoundError:
+            raise ValidationError({'error': 'Kursorun vaxtı bitib, axtarışı yenidən başladın'})
+        except (ApiError, TransportError) as e:
+            self.close_point_in_time(client, pit_id)
+            # With a cursor, a rejected request means its search_after values do not fit the sort.
+            if cursor and isinstance(e, BadRequestError):
+                raise ValidationError({'error': 'Kursor səhvdir'})
+            raise
+
+        hits = response['hits']['hits']
+        pit_id = response.get('pit_id', pit_id)
+        next_url = None
+        if len(hits) < body['size']:
+            self.close_point_in_time(client, pit_id)
+        else:
+            next_cursor = self.encode_cursor(pit_id, hits[-1]['sort'])
+            next_url = replace_query_param(
+                remove_query_param(request.build_absolute_uri(), 'pagination'),
+                self.cursor_query_param,
+                next_cursor
+            )
+
+        return {
+            'count': response['hits']['total']['value'],
+            'next': next_url,
+            'previous': None,
+            'results': self.get_results(response, body),
+        }, response
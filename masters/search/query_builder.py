@@ -0,0 +1,335 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+from search.analyzers import transliterate
+
+
+INTEGER_PARAMS = ('profession_category_id', 'profession_service_id', 'city_id', 'district_id', 'experience')
+GEO_PARAMS = ('lat', 'lon', 'radius')
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 50
+DISTANCE_ORDERING = 'distance'
+TEXT_FIELDS = [
+    'full_name^3', 'custom_profession^2',
+    'profession_category.display_name^2', 'profession_category.name',
+    'profession_service.display_name^2', 'profession_service.name',
+]
+NESTED_TEXT_FIELDS = {
+    'cities': ['cities.display_name', 'cities.name'],
+    'districts': ['districts.display_name', 'districts.name'],
+}
+TERM_FACETS = {
+    'profession_category': 'profession_category.id',
+    'profession_service': 'profession_service.id',
+}
+NESTED_FACETS = {
+    'cities': 'cities.id',
+    'districts': 'districts.id',
+}
+EXPERIENCE_RANGES = [
+    {'key': '0-1', 'to': 1},
+    {'key': '1-3', 'from': 1, 'to': 3},
+    {'key': '3-5', 'from': 3, 'to': 5},
+    {'key': '5-10', 'from': 5, 'to': 10},
+    {'key': '10+', 'from': 10},
+]
+FACET_SIZE = 100
+
+
+def normalize_search_params(query_params):
+    """
+    Returns the search parameters in canonical form: only known keys,
+    integers parsed, the search text trimmed, lowercased and with collapsed
+    whitespace. Equal searches therefore produce equal dicts, which makes
+    them usable as cache keys.
+
+    Raises:
+        ValidationError: If an ID or experience filter is not an integer, or
+            the location parameters are incomplete or out of range.
+    """
+    params = {}
+    for name in INTEGER_PARAMS:
+        value = query_params.get(name)
+        if value in (None, ''):
+            continue
+        try:
+            params[name] = int(value)
+        except ValueError:
+            raise ValidationError({'error': f'{name} tam ədəd olmalıdır'})
+
+    params.update(_normalize_geo_params(query_params))
+
+    search = ' '.join((query_params.get('search') or '').split()).lower()
+    if search:
+        params['search'] = search
+
+    ordering = (query_params.get('ordering') or '').strip()
+    if ordering == DISTANCE_ORDERING and 'lat' not in params:
+        raise ValidationError({'error': 'Məsafəyə görə sıralama üçün lat və lon göndərilməlidir'})
+    if ordering:
+        params['ordering'] = ordering
+    elif 'lat' in params:
+        # Location-aware searches list the nearest masters first unless asked otherwise.
+        params['ordering'] = DISTANCE_ORDERING
+
+    if query_params.get('facets') in ('1', 'true'):
+        params['facets'] = True
+    return params
+
+
+def ranking_functions(ranking):
+    """
+    Returns the function_score functions for the SEARCH_RANKING weights.
+    Before weighting, the average rating is scaled to 0..1, the review count
+    is log10(1 + count) (about 2 at a hundred reviews), the profile
+    completeness is already 0..1 and recency decays from 1 for masters who
+    just joined to 0.5 at `recency_scale`.
+    """
+    return [
+        {
+            'field_value_factor': {'field': 'average_rating', 'factor': 0.2, 'missing': 0},
+            'weight': ranking['rating_weight'],
+        },
+        {
+            'field_value_factor': {'field': 'review_count', 'modifier': 'log1p', 'missing': 0},
+            'weight': ranking['review_count_weight'],
+        },
+        {
+            'field_value_factor': {'field': 'profile_completeness', 'missing': 0},
+            'weight': ranking['completeness_weight'],
+        },
+        {
+            'gauss': {'created_at': {'origin': 'now', 'scale': ranking['recency_scale'], 'decay': 0.5}},
+            'weight': ranking['recency_weight'],
+        },
+    ]
+
+
+def _normalize_geo_params(query_params):
+    if not any(query_params.get(name) not in (None, '') for name in GEO_PARAMS):
+        return {}
+    try:
+        latitude = float(query_params['lat'])
+        longitude = float(query_params['lon'])
+        radius = float(query_params.get('radius') or DEFAULT_RADIUS_KM)
+    except (KeyError, ValueError):
+        raise ValidationError({'error': 'lat, lon və radius düzgün daxil edilməlidir'})
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or not 0 < radius <= MAX_RADIUS_KM:
+        raise ValidationError({'error': 'Koordinatlar və ya radius icazə verilən aralıqda deyil'})
+    return {'lat': latitude, 'lon': longitude, 'radius': radius}
+
+
+class MasterQueryBuilder:
+    """
+    Builds the Elasticsearch body for master searches.
+
+    Structured filters go to `bool.filter`, where they are not scored and
+    their bitsets are cached by Elasticsearch. Only the free text search
+    contributes to the score.
+
+    With facets enabled, filters that belong to a facet move to `post_filter`
+    instead, and each facet aggregation applies every filter except its own,
+    so the counts show what each alternative selection would return.
+    """
+
+    def __init__(self):
+        self.filters = []
+        self.facet_filters = {}
+        self.must = []
+        self.sort = None
+        self.facets = False
+        self.ranking = None
+
+    def _add_filter(self, clause, facet):
+        if facet:
+            self.facet_filters[facet] = clause
+        else:
+            self.filters.append(clause)
+
+    def filter_term(self, field, value, facet=None):
+        self._add_filter({'term': {field: value}}, facet)
+        return self
+
+    def filter_nested_term(self, path, field, value, facet=None):
+        self._add_filter({'nested': {'path': path, 'query': {'term': {field: value}}}}, facet)
+        return self
+
+    def with_facets(self):
+        self.facets = True
+        return self
+
+    def _filters_except(self, facet):
+        return {'bool': {'filter': [clause for name, clause in self.facet_filters.items() if name != facet]}}
+
+    def _facet_aggregations(self):
+        aggs = {}
+        for facet, field in TERM_FACETS.items():
+            aggs[facet] = {
+                'filter': self._filters_except(facet),
+                'aggs': {'values': {'terms': {'field': field, 'size': FACET_SIZE}}},
+            }
+        for facet, field in NESTED_FACETS.items():
+            aggs[facet] = {
+                'filter': self._filters_except(facet),
+                'aggs': {'nested': {
+                    'nested': {'path': facet},
+                    'aggs': {'values': {
+                        'terms': {'field': field, 'size': FACET_SIZE},
+                        # Count masters, not nested city/district entries.
+                        'aggs': {'masters': {'reverse_nested': {}}},
+                    }},
+                }},
+            }
+        aggs['experience'] = {
+            'filter': self._filters_except('experience'),
+            'aggs': {'values': {'range': {'field': 'experience', 'ranges': EXPERIENCE_RANGES}}},
+        }
+        return aggs
+
+    def _text_queries(self, text, fields):
+        """
+        Matches the text as typed against the Azerbaijani-analyzed fields, and
+        its ASCII transliteration against the `.folded` subfields, both with
+        fuzziness so that small typos still hit.
+        """
+        folded_fields = [self._folded(field) for field in fields]
+        return [
+            {'multi_match': {'query': text, 'fields': fields, 'fuzziness': 'AUTO', 'prefix_length': 1}},
+            {'multi_match': {
+                'query': transliterate(text), 'fields': folded_fields, 'fuzziness': 'AUTO', 'prefix_length': 1
+            }},
+        ]
+
+    def _folded(self, field):
+        name, _, boost = field.partition('^')
+        return f'{name}.folded^{boost}' if boost else f'{name}.folded'
+
+    def match_text(self, text):
+        """
+        Matches the text against the master's own fields or any of its cities or districts.
+        """
+        should = self._text_queries(text, TEXT_FIELDS)
+        for path, fields in NESTED_TEXT_FIELDS.items():
+            should.append({'nested': {'path': path, 'query': {
+                'bool': {'should': self._text_queries(text, fields), 'minimum_should_match': 1}
+            }}})
+        self.must.append({'bool': {'should': should, 'minimum_should_match': 1}})
+        return self
+
+    def filter_distance(self, latitude, longitude, radius_km):
+        self.filters.append({'geo_distance': {
+            'distance': f'{radius_km}km',
+            'location': {'lat': latitude, 'lon': longitude},
+        }})
+        return self
+
+    def order_by(self, ordering):
+        self.sort = [ordering]
+        return self
+
+    def order_by_distance(self, latitude, longitude):
+        """
+        Sorts nearest first, then by score. The distance in kilometres is
+        the first sort value of every hit.
+        """
+        self.sort = [
+            {'_geo_distance': {
+                'location': {'lat': latitude, 'lon': longitude},
+                'order': 'asc',
+                'unit': 'km',
+                'distance_type': 'arc',
+            }},
+            '_score',
+        ]
+        return self
+
+    def rank_by(self, ranking):
+        """
+        Scores hits with function_score: the text relevance times `text_weight`
+        plus the weighted `ranking_functions`. Filters still do not score, so
+        without a search text the boosts alone decide the order.
+        """
+        self.ranking = ranking
+        return self
+
+    def _query(self, filters):
+        query = {'bool': {'filter': filters, 'must': self.must}}
+        if not self.ranking:
+            return query
+        query['bool']['boost'] = self.ranking['text_weight']
+        return {'function_score': {
+            'query': query,
+            'functions': ranking_functions(self.ranking),
+            'score_mode': 'sum',
+            'boost_mode': 'sum',
+        }}
+
+    def build(self):
+        filters = list(self.filters)
+        body = {'query': self._query(filters)}
+        if self.facets:
+            body['post_filter'] = self._filters_except(None)
+            body['aggs'] = self._facet_aggregations()
+        else:
+            filters.extend(self.facet_filters.values())
+        if self.sort:
+            body['sort'] = self.sort
+        return body
+
+
+def parse_facets(aggregations):
+    """
+    Turns the facet aggregations of a response into
+    {facet: [{'id' or 'key', 'count'}, ...]}.
+    """
+    facets = {}
+    for facet in TERM_FACETS:
+        facets[facet] = [
+            {'id': bucket['key'], 'count': bucket['doc_count']}
+            for bucket in aggregations[facet]['values']['buckets']
+        ]
+    for facet in NESTED_FACETS:
+        facets[facet] = [
+            {'id': bucket['key'], 'count': bucket['masters']['doc_count']}
+            for bucket in aggregations[facet]['nested']['values']['buckets']
+        ]
+    facets['experience'] = [
+        {'key': bucket['key'], 'count': bucket['doc_count']}
+        for bucket in aggregations['experience']['values']['buckets']
+    ]
+    return facets
+
+
+def build_master_search(params, ranking=None):
+    """
+    Builds the search body from parameters returned by `normalize_search_params`.
+
+    Without an ordering, hits are ranked with the SEARCH_RANKING settings,
+    or with `ranking` if given (e.g. to evaluate other weights).
+    """
+    ranking = ranking or settings.SEARCH_RANKING
+    builder = MasterQueryBuilder()
+    if 'profession_category_id' in params:
+        builder.filter_term('profession_category.id', params['profession_category_id'], facet='profession_category')
+    if 'profession_service_id' in params:
+        builder.filter_term('profession_service.id', params['profession_service_id'], facet='profession_service')
+    if 'city_id' in params:
+        builder.filter_nested_term('cities', 'cities.id', params['city_id'], facet='cities')
+    if 'district_id' in params:
+        builder.filter_nested_term('districts', 'districts.id', params['district_id'], facet='districts')
+    if 'experience' in params:
+        builder.filter_term('experience', params['experience'], facet='experience')
+    if 'lat' in params:
+        builder.filter_distance(params['lat'], params['lon'], params['radius'])
+    if params.get('facets'):
+        builder.with_facets()
+    if 'search' in params:
+        builder.match_text(params['search'])
+    if params.get('ordering') == DISTANCE_ORDERING:
+        builder.order_by_distance(params['lat'], params['lon'])
+    elif 'ordering' in params:
+        builder.order_by(params['ordering'])
+    # Also breaks ties between masters at the same distance.
+    if ranking['enabled'] and params.get('ordering') in (None, DISTANCE_ORDERING):
+        builder.rank_by(ranking)
+    return builder.build()
@@ -0,0 +1,49 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+INDEX_VERSION_KEY = 'search:index_version'
+RESULT_KEY = 'search:results:v{version}:{digest}'
+
+
+def get_index_version():
+    version = cache.get(INDEX_VERSION_KEY)
+    if version is None:
+        cache.add(INDEX_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(INDEX_VERSION_KEY)
+    return version
+
+
+def bump_index_version():
+    """
+    Makes every cached search result stale. Called after documents are
+    written to the masters index.
+    """
+    try:
+        cache.incr(INDEX_VERSION_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def get_or_set_search_results(params, builder):
+    """
+    Returns the cached response for a normalized parameter set, building
+    and caching it for SEARCH_RESULT_CACHE_TIMEOUT seconds on a miss.
+
+    Args:
+        params (dict): Canonical parameters, including paging.
+        builder (callable): Runs the search and returns the response data,
+            or None if it is degraded and must not be cached.
+    """
+    digest = hashlib.md5(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+    key = RESULT_KEY.format(version=get_index_version(), digest=digest)
+    data = cache.get(key)
+    if data is None:
+        data = builder()
+        if data is not None:
+            cache.set(key, data, timeout=settings.SEARCH_RESULT_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,63 @@
+from django.contrib.postgres.search import SearchVector
+from django.db import connection
+from django.db.models import TextField, Value
+
+from search.analyzers import transliterate
+
+# Postgres text search configuration. 'simple' only lowercases, which suits
+# Azerbaijani names better than any of the stemming configurations.
+SEARCH_CONFIG = 'simple'
+
+
+def _weighted_texts(master):
+    category = master.profession_category
+    service = master.profession_service
+    yield 'A', [master.full_name, master.custom_profession]
+    yield 'B', [
+        category.display_name if category else None, category.name if category else None,
+        service.display_name if service else None, service.name if service else None,
+    ]
+    yield 'C', [
+        name
+        for location in [*master.cities.all(), *master.districts.all()]
+        for name in (location.display_name, location.name)
+    ]
+
+
+def build_search_vector(master):
+    """
+    Returns the search vector expression of a master: its name and custom
+    profession weighted A, category and service B, cities and districts C.
+
+    Every text is stored together with its ASCII transliteration, so that
+    queries typed without Azerbaijani letters still match.
+    """
+    vector = None
+    for weight, texts in _weighted_texts(master):
+        text = ' '.join(text for text in texts if text)
+        if not text:
+            continue
+        part = SearchVector(
+            Value(f'{text} {transliterate(text)}', output_field=TextField()),
+            weight=weight,
+            config=SEARCH_CONFIG
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(masters):
+    """
+    Rewrites the `search_vector` column of the given masters.
+
+    The masters should come with their category, service, cities and
+    districts loaded, as from `MasterDocument.get_queryset()`. Does nothing
+    on databases other than PostgreSQL.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    masters = list(masters)
+    for master in masters:
+        master.search_vector = build_search_vector(master)
+    if masters:
+        type(masters[0]).objects.bulk_update(masters, ['search_vector'])
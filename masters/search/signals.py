@@ -1,31 +1,94 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
+from django.db import transaction
 from django.dispatch import receiver
+
 from users.models.master_model import Master
-from .documents import MasterDocument
-import logging
+from services.models.category_model import Category
+from services.models.service_model import Service
+from core.models.city_model import City, District
+from reviews.models.review_models import Review
+from .fan_out import RELATED_MASTER_LOOKUPS
+from .indexing import queue_master_index, queue_master_delete, queue_master_rating_update
+from .tasks import update_suggest_document, fan_out_related_change
+
+# Fields of the related models that are copied into the master document.
+DOCUMENT_FIELDS = {'name', 'display_name'}
+# Master columns the document does not use. Saving only these, e.g. the
+# `last_login` written on every login, leaves the document as it is.
+UNINDEXED_MASTER_FIELDS = {
+    'password', 'last_login', 'is_superuser', 'is_staff', 'is_active', 'date_joined', 'search_vector',
+}
+
+
+def _related_master_ids(instance):
+    lookup = RELATED_MASTER_LOOKUPS[instance._meta.label_lower]
+    return Master.objects.filter(**{lookup: instance}).values_list('pk', flat=True)
 
-logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=Master)
-def update_master_document(sender, instance, created, **kwargs):
-    try:
-        # Yeni sənəd yaradılır və məlumatlar köçürülür
-        master_doc = MasterDocument(
-            meta={'id': instance.id},
-            full_name=instance.full_name,  # Modeldəki uyğun sahələri əlavə edin
-            experience=instance.experience,
-            # Digər lazımi sahələri əlavə edin
-        )
-        master_doc.save()
-        logger.info(f"Master document updated/created for ID: {instance.id}")
-    except Exception as e:
-        logger.error(f"Error updating master document for ID {instance.id}: {str(e)}")
+def update_master_document(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= UNINDEXED_MASTER_FIELDS:
+        return
+    queue_master_index([instance.pk])
+
 
 @receiver(post_delete, sender=Master)
 def delete_master_document(sender, instance, **kwargs):
-    try:
-        doc = MasterDocument.get(id=instance.id)
-        doc.delete()
-        logger.info(f"Master document deleted for ID: {instance.id}")
-    except Exception as e:
-        logger.error(f"Error deleting master document for ID {instance.id}: {str(e)}")
\ No newline at end of file
+    queue_master_delete([instance.pk])
+
+
+@receiver(m2m_changed, sender=Master.cities.through)
+@receiver(m2m_changed, sender=Master.districts.through)
+def update_master_document_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        queue_master_index([instance.pk])
+    elif pk_set:
+        queue_master_index(pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=District)
+def update_master_documents_on_related_change(sender, instance, created, update_fields=None, **kwargs):
+    # A new category, service, city or district has no masters yet.
+    if created or (update_fields and not DOCUMENT_FIELDS & set(update_fields)):
+        return
+    # Renaming a city can touch most masters, so the fan-out runs in the background.
+    args = (sender._meta.app_label, sender._meta.model_name, instance.pk)
+    transaction.on_commit(lambda: fan_out_related_change.delay(*args))
+
+
+@receiver(pre_delete, sender=City)
+@receiver(pre_delete, sender=District)
+def update_master_documents_on_location_delete(sender, instance, **kwargs):
+    # Collected before the delete clears the M2M rows.
+    queue_master_index(_related_master_ids(instance))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_master_ratings_on_review_change(sender, instance, origin=None, **kwargs):
+    # Reviews deleted together with their master need no update.
+    if getattr(origin, 'model', origin.__class__) is Master:
+        return
+    master_ids = {instance.master_id}
+    previous = getattr(instance, '_previous_ratings', None)
+    if previous:
+        master_ids.add(previous['master_id'])
+    queue_master_rating_update(master_ids)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=District)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=City)
+@receiver(post_delete, sender=District)
+def update_suggest_document_on_change(sender, instance, signal, **kwargs):
+    args = (sender._meta.app_label, sender._meta.model_name, instance.pk, signal is post_delete)
+    transaction.on_commit(lambda: update_suggest_document.delay(*args))
@@ -0,0 +1,77 @@
+import logging
+
+from django.conf import settings
+from elasticsearch import ApiError, TransportError
+
+from search.client import get_client, is_healthy
+
+logger = logging.getLogger(__name__)
+
+# Index (or alias) searched for suggestions and the type reported for its options.
+SUGGEST_INDICES = {
+    'masters': 'master',
+    'suggest_categories': 'category',
+    'suggest_services': 'service',
+    'suggest_cities': 'city',
+    'suggest_districts': 'district',
+}
+
+
+def _suggestion_type(index_name):
+    for name, suggestion_type in SUGGEST_INDICES.items():
+        # Versioned indices behind an alias are reported as e.g. masters-20250101120000.
+        if index_name == name or index_name.startswith(f'{name}-'):
+            return suggestion_type
+    return None
+
+
+def get_suggestions(prefix, size):
+    """
+    Returns type-ahead suggestions for the prefix from every suggestion
+    index in a single completion-suggester request.
+
+    Only the completion FSTs are consulted, no query is scored, and the
+    request is cut off after SEARCH_SUGGEST_TIMEOUT seconds. A slow or
+    unavailable cluster yields None instead of an error, so that callers
+    can tell it from a prefix without suggestions and avoid caching it.
+
+    Returns:
+        list: Dicts with `type`, `id`, `text` and `slug` (masters only), best
+            first, or None if the suggestions could not be fetched.
+    """
+    if not is_healthy():
+        return None
+
+    body = {
+        '_source': ['full_name', 'slug', 'display_name'],
+        'suggest': {
+            'suggestions': {
+                'prefix': prefix,
+                'completion': {'field': 'suggest', 'size': size, 'skip_duplicates': True},
+            }
+        },
+    }
+    try:
+        response = get_client().options(request_timeout=settings.SEARCH_SUGGEST_TIMEOUT).search(
+            index=','.join(SUGGEST_INDICES),
+            body=body,
+            ignore_unavailable=True,
+        )
+    except (ApiError, TransportError) as e:
+        logger.warning(f"Suggest request failed: {e}")
+        return None
+
+    options = response['suggest']['suggestions'][0]['options']
+    options = sorted(options, key=lambda option: option['_score'], reverse=True)[:size]
+    suggestions = []
+    for option in options:
+        source = option.get('_source', {})
+        suggestion = {
+            'type': _suggestion_type(option['_index']),
+            'id': int(option['_id']),
+            'text': source.get('full_name') or source.get('display_name') or option['text'],
+        }
+        if 'slug' in source:
+            suggestion['slug'] = source['slug']
+        suggestions.append(suggestion)
+    return suggestions
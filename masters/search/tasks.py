@@ -0,0 +1,71 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from search.indexing import flush_pending, FLUSH_SCHEDULED_KEY
+from search.result_cache import bump_index_version
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=30)
+def flush_search_index(self):
+    """
+    Sends the queued master index/update/delete operations to Elasticsearch.
+    Scheduled once per coalescing window by `search.indexing`, and
+    periodically by Celery beat as a safety net.
+    """
+    # Clear the flag first so updates queued while flushing schedule a new run.
+    cache.delete(FLUSH_SCHEDULED_KEY)
+    try:
+        indexed, updated, deleted = flush_pending()
+    except Exception as exc:
+        raise self.retry(exc=exc)
+    return f'{indexed} indexed, {updated} rating updates, {deleted} deleted'
+
+
+@shared_task
+def update_suggest_document(app_label, model_name, pk, delete=False):
+    """
+    Indexes or deletes the type-ahead suggestion of a category, service, city or district.
+    """
+    from django.apps import apps
+    from django_elasticsearch_dsl.registries import registry
+    from search.documents import SuggestDocument
+
+    model = apps.get_model(app_label, model_name)
+    for document_class in registry.get_documents([model]):
+        if not issubclass(document_class, SuggestDocument):
+            continue
+        document = document_class()
+        if delete:
+            document._get_connection().options(ignore_status=404).delete(index=document._index._name, id=pk)
+            continue
+        instance = model.objects.filter(pk=pk).first()
+        if instance is not None:
+            document.update(instance)
+    bump_index_version()
+
+
+@shared_task(bind=True, max_retries=5, default_retry_delay=30)
+def fan_out_related_change(self, app_label, model_name, pk):
+    """
+    Updates the master documents that embed a changed category, service,
+    city or district, in chunks (see `search.fan_out`).
+    """
+    from django.apps import apps
+    from search import fan_out
+
+    model = apps.get_model(app_label, model_name)
+    try:
+        updated = fan_out.fan_out_related_change(model, pk, resume=self.request.retries > 0)
+    except Exception as exc:
+        raise self.retry(exc=exc)
+    return f'{updated} master documents updated'
+
+
+@shared_task
+def profile_slow_search(shape, index, body):
+    """
+    Re-runs a slow search with `profile` and logs the profile (see `search.metrics`).
+    """
+    from search.metrics import log_search_profile
+
+    log_search_profile(shape, index, body)
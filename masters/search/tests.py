@@ -0,0 +1,153 @@
+import io
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from search.analyzers import az_folding, transliterate
+from search.backends.circuit_breaker import CircuitBreaker
+from search.indexing import REINDEX_CAPTURE_TIMEOUT, REINDEX_CHANGED_KEY, record_reindex_changes
+from search.metrics import record_search
+from users.models import Master
+
+
+class TransliterateTests(SimpleTestCase):
+    def test_folds_azerbaijani_letters(self):
+        self.assertEqual(transliterate('şəhriyyə'), 'sehriyye')
+        self.assertEqual(transliterate('Məmmədov Əli'), 'Memmedov eli')
+        self.assertEqual(transliterate('İlqar Çələbi Göyçay Ağdaş Ürək'), 'ilqar celebi Goycay Agdas urek')
+
+    def test_transliterates_other_scripts(self):
+        self.assertEqual(transliterate('уста'), 'usta')
+
+    def test_matches_index_folding(self):
+        mappings = az_folding.get_definition()['mappings']
+        for mapping in mappings:
+            letter, folded = mapping.split(' => ')
+            self.assertEqual(transliterate(letter), folded)
+
+
+
+@override_settings(SEARCH_CIRCUIT_FAILURE_THRESHOLD=2, SEARCH_CIRCUIT_RESET_SECONDS=30)
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.breaker = CircuitBreaker('test')
+
+    def trip(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def expire_open_period(self):
+        cache.delete(self.breaker.open_key)
+
+    def test_opens_at_failure_threshold(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_lets_one_trial_request_through_after_reset(self):
+        self.trip()
+        self.expire_open_period()
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_successful_trial_closes(self):
+        self.trip()
+        self.expire_open_period()
+        self.breaker.allow_request()
+        self.breaker.record_success()
+        self.assertTrue(self.breaker.allow_request())
+        self.assertTrue(self.breaker.allow_request())
+        # A single failure after closing starts a new count.
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_failed_trial_reopens(self):
+        self.trip()
+        self.expire_open_period()
+        self.breaker.allow_request()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.is_open())
+        self.assertFalse(self.breaker.allow_request())
+
+
+class SuggestAPIViewTests(SimpleTestCase):
+    def test_prefix_is_folded(self):
+        with mock.patch('apis.search_apis.search_views.get_suggestions', return_value=[]) as get_suggestions:
+            response = self.client.get(reverse('search_apis:master-search-suggest'), {'q': ' Şəhər  usta '})
+        self.assertEqual(response.status_code, 200)
+        get_suggestions.assert_called_once_with('seher usta', 8)
+
+    def test_unavailable_suggestions_are_not_cached(self):
+        with mock.patch('apis.search_apis.search_views.get_suggestions', side_effect=[None, []]) as get_suggestions:
+            for _ in range(2):
+                response = self.client.get(reverse('search_apis:master-search-suggest'), {'q': 'əlçi'})
+                self.assertEqual(response.json(), {'suggestions': []})
+        self.assertEqual(get_suggestions.call_count, 2)
+
+
+class RecordSearchTests(SimpleTestCase):
+    def test_redis_errors_are_not_raised(self):
+        redis = mock.MagicMock()
+        redis.pipeline.return_value.execute.side_effect = ConnectionError('Redis is down')
+        with mock.patch('search.metrics._redis', return_value=redis):
+            record_search('elasticsearch:search', 900, 3, took_ms=850, body={'query': {}}, index='masters')
+
+    @override_settings(SEARCH_SLOW_QUERY_PROFILE=True)
+    def test_broker_errors_are_not_raised(self):
+        redis = mock.MagicMock()
+        redis.pipeline.return_value.execute.return_value = [1, 1, True]
+        with mock.patch('search.metrics._redis', return_value=redis), \
+                mock.patch('search.tasks.profile_slow_search.delay', side_effect=OSError('Broker is down')) as delay:
+            record_search('elasticsearch:search', 900, 3, took_ms=850, body={'query': {}}, index='masters')
+        delay.assert_called_once()
+
+
+class MasterDocumentSignalTests(TestCase):
+    def setUp(self):
+        self.master = Master.objects.create(full_name='Əli Məmmədov', phone_number='+994501234567')
+
+    def test_login_does_not_queue_a_reindex(self):
+        with mock.patch('search.signals.queue_master_index') as queue_master_index:
+            self.master.save(update_fields=['last_login'])
+        queue_master_index.assert_not_called()
+
+    def test_indexed_fields_queue_a_reindex(self):
+        with mock.patch('search.signals.queue_master_index') as queue_master_index:
+            self.master.save(update_fields=['full_name', 'last_login'])
+            self.master.save()
+        self.assertEqual(queue_master_index.call_count, 2)
+
+
+class ReindexCaptureTests(SimpleTestCase):
+    def test_recorded_changes_expire(self):
+        redis = mock.MagicMock()
+        redis.exists.return_value = 1
+        with mock.patch('search.indexing._redis', return_value=redis):
+            record_reindex_changes([3, 5])
+        pipeline = redis.pipeline.return_value
+        pipeline.sadd.assert_called_once_with(REINDEX_CHANGED_KEY, 3, 5)
+        pipeline.expire.assert_called_once_with(REINDEX_CHANGED_KEY, REINDEX_CAPTURE_TIMEOUT)
+
+    def test_nothing_is_recorded_without_a_running_reindex(self):
+        redis = mock.MagicMock()
+        redis.exists.return_value = 0
+        with mock.patch('search.indexing._redis', return_value=redis):
+            record_reindex_changes([3])
+        redis.pipeline.assert_not_called()
+
+    def test_resume_fails_once_the_capture_expired(self):
+        checkpoint = {'index': 'masters-20260101000000', 'last_id': 10, 'indexed': 10}
+        with mock.patch('django.core.cache.cache.get', return_value=checkpoint), \
+                mock.patch(
+                    'search.management.commands.reindex_masters.refresh_reindex_capture', return_value=False
+                ), \
+                mock.patch('search.documents.MasterDocument._get_connection'):
+            with self.assertRaises(CommandError):
+                call_command('reindex_masters', resume=True, stdout=io.StringIO())
@@ -0,0 +1,83 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from users.models.master_model import Master
+from utils.geo import encode_geohash, filter_nearby, haversine_distance
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Compares the geohash-prefiltered nearby query with a full-table haversine scan.
+
+    Synthetic masters are inserted inside a transaction that is rolled back
+    at the end, so the command leaves the database untouched.
+
+    Usage:
+        python manage.py benchmark_nearby --masters=50000 --radius=5 --runs=20
+    """
+
+    help = 'Benchmark the nearby masters query against a full haversine scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--masters', type=int, default=50000, help='Number of synthetic masters.')
+        parser.add_argument('--radius', type=float, default=5, help='Search radius in kilometres.')
+        parser.add_argument('--runs', type=int, default=20, help='Number of queries per strategy.')
+        parser.add_argument('--lat', type=float, default=40.4093, help='Centre latitude (Baku by default).')
+        parser.add_argument('--lon', type=float, default=49.8671, help='Centre longitude (Baku by default).')
+
+    def _create_masters(self, count, latitude, longitude):
+        masters = []
+        for i in range(count):
+            lat = latitude + random.uniform(-1.5, 1.5)
+            lon = longitude + random.uniform(-1.5, 1.5)
+            masters.append(Master(
+                full_name=f'Benchmark Master {i}',
+                slug=f'benchmark-master-{i}',
+                phone_number=None,
+                latitude=lat,
+                longitude=lon,
+                geohash=encode_geohash(lat, lon),
+                is_active_on_main_page=True,
+            ))
+        Master.objects.bulk_create(masters, batch_size=2000)
+
+    def _time(self, queryset, runs):
+        started = time.perf_counter()
+        for _ in range(runs):
+            ids = list(queryset.values_list('id', flat=True))
+        return (time.perf_counter() - started) / runs * 1000, ids
+
+    def handle(self, *args, **options):
+        latitude, longitude = options['lat'], options['lon']
+        radius, runs = options['radius'], options['runs']
+
+        try:
+            with transaction.atomic():
+                self._create_masters(options['masters'], latitude, longitude)
+
+                full_scan = Master.objects.annotate(
+                    distance=haversine_distance(latitude, longitude)
+                ).filter(distance__lte=radius).order_by('distance', 'id')
+                prefiltered = filter_nearby(Master.objects.all(), latitude, longitude, radius)
+
+                full_ms, full_ids = self._time(full_scan, runs)
+                nearby_ms, nearby_ids = self._time(prefiltered, runs)
+
+                self.stdout.write(f'Full haversine scan: {full_ms:.2f} ms/query, {len(full_ids)} masters')
+                self.stdout.write(f'Geohash prefilter:   {nearby_ms:.2f} ms/query, {len(nearby_ids)} masters')
+                if full_ids != nearby_ids:
+                    self.stdout.write(self.style.ERROR('Result sets differ between strategies.'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Results match, speedup x{full_ms / nearby_ms:.1f}' if nearby_ms else 'Results match.'
+                    ))
+                raise _Rollback
+        except _Rollback:
+            pass
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:09
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+
+def populate_ranking_scores(apps, schema_editor):
+    Master = apps.get_model('users', 'Master')
+    MasterRatingSummary = apps.get_model('reviews', 'MasterRatingSummary')
+
+    prior_weight = settings.RANKING_PRIOR_WEIGHT
+    prior_mean = settings.RANKING_PRIOR_MEAN
+    score = MasterRatingSummary.objects.filter(
+        master_id=OuterRef('pk'),
+        rating_count__gt=0
+    ).annotate(
+        score=(
+            Value(prior_weight * prior_mean, output_field=FloatField()) + Cast('rating_sum', FloatField())
+        ) / (
+            Value(float(prior_weight), output_field=FloatField()) + Cast('rating_count', FloatField())
+        )
+    ).values('score')[:1]
+    Master.objects.update(ranking_score=Coalesce(Subquery(score), Value(0.0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0001_initial'),
+        ('reviews', '0002_master_rating_summary'),
+        ('services', '0001_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='master',
+            name='ranking_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='master',
+            index=models.Index(fields=['is_active_on_main_page', '-ranking_score'], name='master_active_ranking_idx'),
+        ),
+        migrations.RunPython(populate_ranking_scores, migrations.RunPython.noop),
+    ]
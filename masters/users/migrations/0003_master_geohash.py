@@ -0,0 +1,64 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:13
+
+from django.db import migrations, models
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=9):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+
+def populate_geohashes(apps, schema_editor):
+    Master = apps.get_model('users', 'Master')
+    masters = Master.objects.filter(latitude__isnull=False, longitude__isnull=False).only('id', 'latitude', 'longitude')
+    for master in masters.iterator(chunk_size=1000):
+        master.geohash = encode_geohash(master.latitude, master.longitude)
+        master.save(update_fields=['geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_master_ranking_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='master',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.RunPython(populate_geohashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:29
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_master_geohash'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='master',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='master',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='master_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='master',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['full_name'], name='master_full_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,82 @@
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import TextField, Value
+from unidecode import unidecode
+
+# Azerbaijani letters and their ASCII spelling, as folded by the search
+# index. Kept here so later changes to the search code do not alter this migration.
+AZ_FOLDING = str.maketrans({
+    'Ə': 'e', 'ə': 'e',
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ç': 'c', 'ç': 'c',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ö': 'o', 'ö': 'o',
+    'Ü': 'u', 'ü': 'u',
+})
+
+
+def transliterate(text):
+    return unidecode(text.translate(AZ_FOLDING))
+
+
+def build_search_vector(master):
+    category = master.profession_category
+    service = master.profession_service
+    weighted_texts = [
+        ('A', [master.full_name, master.custom_profession]),
+        ('B', [
+            category.display_name if category else None, category.name if category else None,
+            service.display_name if service else None, service.name if service else None,
+        ]),
+        ('C', [
+            name
+            for location in [*master.cities.all(), *master.districts.all()]
+            for name in (location.display_name, location.name)
+        ]),
+    ]
+    vector = None
+    for weight, texts in weighted_texts:
+        text = ' '.join(text for text in texts if text)
+        if not text:
+            continue
+        part = SearchVector(
+            Value(f'{text} {transliterate(text)}', output_field=TextField()),
+            weight=weight,
+            config='simple'
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def rebuild_search_vectors(apps, schema_editor):
+    """
+    Builds the search vectors of all masters. Vectors written before
+    Azerbaijani letters were folded hold e.g. "m@mm@dov" instead of "memmedov".
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Master = apps.get_model('users', 'Master')
+    masters = Master.objects.select_related(
+        'profession_category', 'profession_service'
+    ).prefetch_related('cities', 'districts').order_by('pk')
+    batch = []
+    for master in masters.iterator(chunk_size=1000):
+        master.search_vector = build_search_vector(master)
+        batch.append(master)
+        if len(batch) == 1000:
+            Master.objects.bulk_update(batch, ['search_vector'])
+            batch = []
+    if batch:
+        Master.objects.bulk_update(batch, ['search_vector'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_master_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_search_vectors, migrations.RunPython.noop),
+    ]
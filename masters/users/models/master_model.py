@@ -1,11 +1,11 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.text import slugify
-from django.db.models import Avg
 from django.core.validators import MaxLengthValidator, MinLengthValidator
 
 from .master_user_manager_model import MasterUserManager
-from reviews.models.review_models import Review
 from services.models.category_model import Category
 from services.models.service_model import Service
 from core.models.city_model import City, District
@@ -13,6 +13,7 @@ from core.models.education_model import Education
 from core.models.language_model import Language
 from utils.validators import *
 from utils.constants import GENDER_STATUS
+from utils.geo import encode_geohash
 
 
 class Master(AbstractUser):
@@ -22,6 +23,8 @@ class Master(AbstractUser):
     email = None
     USERNAME_FIELD = 'phone_number'
     REQUIRED_FIELDS = ['full_name']
+    # Written by bulk UPDATEs only: the rating summary's ranking score and the search vector.
+    UPDATE_MANAGED_FIELDS = ('ranking_score', 'search_vector')
     objects = MasterUserManager()
 
     profession_category = models.ForeignKey(
@@ -155,123 +158,136 @@ class Master(AbstractUser):
         null=True, 
         blank=True
     )
+    geohash = models.CharField(
+        max_length=12,
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
+    ranking_score = models.FloatField(
+        default=0,
+        editable=False
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=['is_active_on_main_page', '-ranking_score'],
+                name='master_active_ranking_idx'
+            ),
+            GinIndex(
+                fields=['search_vector'],
+                name='master_search_vector_idx'
+            ),
+            GinIndex(
+                fields=['full_name'],
+                name='master_full_name_trgm_idx',
+                opclasses=['gin_trgm_ops']
+            ),
+        ]
     
+    def _rating_summary(self):
+        """
+        Returns the denormalized rating summary, or None if the master has no reviews yet.
+        """
+        return getattr(self, 'rating_summary', None)
+
+    def _summary_average(self, field):
+        summary = self._rating_summary()
+        average = summary.average(field) if summary else None
+        if average is None:
+            return ''
+        return average
+
     def average_rating(self):
         """
         Returns the average rating for the master based on all associated reviews.
         Returns an empty string if no ratings are available.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('rating'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('rating')
 
     @property
     def average_responsible(self):
         """
         Returns the average 'responsible' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('responsible'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('responsible')
 
     @property
     def average_neat(self):
         """
         Returns the average 'neat' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('neat'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('neat')
 
     @property
     def average_time_management(self):
         """
         Returns the average 'time_management' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('time_management'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('time_management')
 
     @property
     def average_communicative(self):
         """
         Returns the average 'communicative' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('communicative'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('communicative')
 
     @property
     def average_punctual(self):
         """
         Returns the average 'punctual' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('punctual'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('punctual')
 
     @property
     def average_professional(self):
         """
         Returns the average 'professional' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('professional'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('professional')
 
     @property
     def average_experienced(self):
         """
         Returns the average 'experienced' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('experienced'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('experienced')
 
     @property
     def average_efficient(self):
         """
         Returns the average 'efficient' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('efficient'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('efficient')
 
     @property
     def average_agile(self):
         """
         Returns the average 'agile' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('agile'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('agile')
 
     @property
     def average_patient(self):
         """
         Returns the average 'patient' score from reviews.
         """
-        average = Review.objects.filter(master=self).aggregate(avg=Avg('patient'))['avg']
-        if average is None:
-            return ''
-        return round(average, 2)
+        return self._summary_average('patient')
 
     @property
     def review_count(self):
         """
         Returns the total number of reviews for this master.
         """
-        return Review.objects.filter(master=self).count()
+        summary = self._rating_summary()
+        return summary.rating_count if summary else 0
     
     def save(self, *args, **kwargs):
         """
@@ -279,6 +295,9 @@ class Master(AbstractUser):
         - Auto-generate a unique slug from the full name if not set.
         - Title-case the full_name and education_detail.
         - Capitalize the note field.
+        - Keep the geohash in sync with latitude and longitude.
+        - Leave the columns maintained by bulk UPDATEs (see
+          UPDATE_MANAGED_FIELDS) out of ordinary saves of existing masters.
         """
         if not self.slug and self.full_name:
             base_slug = slugify(self.full_name)
@@ -298,4 +317,19 @@ class Master(AbstractUser):
         if self.note:
             self.note = self.note.capitalize()
 
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = None
+
+        if not self._state.adding and not args and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            # Otherwise a profile edit would write back a stale ranking score
+            # over one a review updated meanwhile.
+            skipped = {*self.UPDATE_MANAGED_FIELDS, *self.get_deferred_fields()}
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped and field.name not in skipped
+            ]
+
         super().save(*args, **kwargs)
\ No newline at end of file
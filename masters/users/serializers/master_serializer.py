@@ -1,13 +1,100 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
+
 from users.models.master_model import Master
+from core.models.city_model import City, District
+from core.models.language_model import Language
+from core.serializers.city_serializers import CitySerializer, DistrictSerializer
+from core.serializers.education_serializer import EducationSerializer
+from core.serializers.language_serializer import LanguageSerializer
+from services.serializers.category_serializer import CategorySerializer
+from services.serializers.service_serializer import ServiceSerializer
+from utils.dynamic_fields import DynamicFieldsMixin
 
 
-class MasterSerializer(serializers.ModelSerializer):
+class MasterSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Full master profile. Supports `fields` and `expand` (see `DynamicFieldsMixin`).
+    """
 
     class Meta:
         model = Master
         exclude = [
             'password', 'is_superuser', 'is_staff', 'user_permissions', 'groups',
-            'last_login', 'date_joined', 'is_active', 
+            'last_login', 'date_joined', 'is_active',
+            # Internal columns maintained by `Master.save` and the search indexer.
+            'search_vector', 'geohash', 'ranking_score',
+        ]
+        expandable_fields = {
+            'profession_category': (CategorySerializer, {}),
+            'profession_service': (ServiceSerializer, {}),
+            'education': (EducationSerializer, {}),
+            'cities': (CitySerializer, {'many': True}),
+            'districts': (DistrictSerializer, {'many': True}),
+            'languages': (LanguageSerializer, {'many': True}),
+        }
+
+
+class MasterCardSerializer(serializers.ModelSerializer):
+    """
+    Compact representation of a master for list pages.
+
+    Querysets passed to this serializer should go through `setup_queryset`,
+    which loads the profession, M2M ids and rating summary up front so a
+    page of cards costs a fixed number of queries.
+    """
+    profession_category_name = serializers.CharField(
+        source='profession_category.display_name', read_only=True, allow_null=True
+    )
+    profession_service_name = serializers.CharField(
+        source='profession_service.display_name', read_only=True, allow_null=True
+    )
+    average_rating = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Master
+        fields = [
+            'id', 'full_name', 'slug', 'profile_picture',
+            'profession_category', 'profession_category_name',
+            'profession_service', 'profession_service_name',
+            'custom_profession', 'experience', 'cities', 'districts', 'languages',
+            'average_rating', 'review_count',
         ]
-   
\ No newline at end of file
+
+    card_columns = [
+        'id', 'full_name', 'slug', 'profile_picture', 'custom_profession', 'experience',
+        'profession_category__id', 'profession_category__display_name',
+        'profession_service__id', 'profession_service__display_name',
+        'rating_summary__rating_sum', 'rating_summary__rating_count',
+    ]
+
+    @classmethod
+    def setup_queryset(cls, queryset):
+        """
+        Narrows a Master queryset to the columns and relations used by the card.
+        """
+        return queryset.select_related(
+            'profession_category', 'profession_service', 'rating_summary'
+        ).prefetch_related(
+            Prefetch('cities', queryset=City.objects.only('id')),
+            Prefetch('districts', queryset=District.objects.only('id')),
+            Prefetch('languages', queryset=Language.objects.only('id')),
+        ).only(*cls.card_columns)
+
+    def get_average_rating(self, obj):
+        return obj.average_rating() or None
+
+
+class NearbyMasterSerializer(MasterCardSerializer):
+    """
+    Master card extended with the distance in kilometres from the searched point.
+    Expects the queryset to be annotated with `distance` by `utils.geo.filter_nearby`.
+    """
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta(MasterCardSerializer.Meta):
+        fields = MasterCardSerializer.Meta.fields + ['distance_km']
+
+    def get_distance_km(self, obj):
+        return round(obj.distance, 2)
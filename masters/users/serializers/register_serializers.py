@@ -3,8 +3,8 @@ from django.contrib.auth.password_validation import validate_password
 from django.core.validators import FileExtensionValidator
 from users.models import Master
 from users.models.master_work_img_model import MasterWorkImage
-from core.models.city_model import City, District
-from core.models.language_model import Language
+from core.reference_cache import get_reference_data
+from core.serializers.reference_fields import ReferencePrimaryKeyRelatedField
 
 
 class PersonalInformationSerializer(serializers.ModelSerializer):
@@ -50,8 +50,10 @@ class ProfessionInformationSerializer(serializers.ModelSerializer):
     - custom profession if 'Other' selected
     """
     
-    cities = serializers.PrimaryKeyRelatedField(many=True, queryset=City.objects.all(), required=True)
-    districts = serializers.PrimaryKeyRelatedField(many=True, queryset=District.objects.all(), required=False,)
+    profession_category = ReferencePrimaryKeyRelatedField('categories', required=False, allow_null=True)
+    profession_service = ReferencePrimaryKeyRelatedField('services', required=False, allow_null=True)
+    cities = ReferencePrimaryKeyRelatedField('cities', many=True, required=True)
+    districts = ReferencePrimaryKeyRelatedField('districts', many=True, required=False)
     
     class Meta:
         model = Master
@@ -80,7 +82,7 @@ class ProfessionInformationSerializer(serializers.ModelSerializer):
 
         districts = data.get('districts', [])
         cities = data.get('cities', [])
-        baku = City.objects.filter(name__iexact='baku').first()
+        baku = get_reference_data().cities.get_by_name('baku')
         if districts and (not baku or baku not in cities):
             raise serializers.ValidationError({"districts": "Rayonlar yalnız Bakı şəhəri seçildikdə əlavə oluna bilər."})
         
@@ -99,7 +101,8 @@ class AdditionalInformationSerializer(serializers.ModelSerializer):
     - average rating info (read-only)
     """
     
-    languages = serializers.PrimaryKeyRelatedField(many=True, queryset=Language.objects.all(), required=True)
+    education = ReferencePrimaryKeyRelatedField('educations', required=False, allow_null=True)
+    languages = ReferencePrimaryKeyRelatedField('languages', many=True, required=True)
     portfolio_images = serializers.ListField(
         child=serializers.ImageField(
             validators=[FileExtensionValidator(allowed_extensions=['jpg', 'png'])],
@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from users.models.master_model import Master
+from users.models.master_work_img_model import MasterWorkImage
+from utils.master_cache import bump_master_cache_version
+
+
+# Master columns no cached response shows. Saving only these, e.g. the
+# `last_login` written on every login, keeps the cached responses.
+UNCACHED_MASTER_FIELDS = {
+    'password', 'last_login', 'is_superuser', 'is_staff', 'is_active', 'date_joined',
+    'search_vector', 'geohash', 'ranking_score',
+}
+
+
+def invalidate_master_cache(master_id):
+    """
+    Bumps the master's cache version once the current transaction commits.
+    """
+    transaction.on_commit(lambda: bump_master_cache_version(master_id))
+
+
+@receiver(post_save, sender=Master)
+@receiver(post_delete, sender=Master)
+def clear_master_cache(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= UNCACHED_MASTER_FIELDS:
+        return
+    invalidate_master_cache(instance.pk)
+
+
+@receiver(m2m_changed, sender=Master.cities.through)
+@receiver(m2m_changed, sender=Master.districts.through)
+@receiver(m2m_changed, sender=Master.languages.through)
+def clear_master_cache_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_master_cache(instance.pk)
+    else:
+        for master_id in pk_set or []:
+            invalidate_master_cache(master_id)
+
+
+@receiver(post_save, sender=MasterWorkImage)
+@receiver(post_delete, sender=MasterWorkImage)
+def clear_master_cache_on_image_change(sender, instance, **kwargs):
+    invalidate_master_cache(instance.master_id)
@@ -1,3 +1,54 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from users.models import Master
+from utils.master_cache import VERSION_KEY, bump_master_cache_version, get_master_cache_version
+
+
+@override_settings(MASTER_CACHE_TIMEOUT=600)
+class MasterCacheVersionTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(cache.delete, VERSION_KEY.format(master_id=404))
+
+    def test_version_keys_expire(self):
+        with mock.patch.object(cache, 'add', wraps=cache.add) as add:
+            get_master_cache_version(404)
+        self.assertEqual(add.call_args.kwargs['timeout'], 1200)
+
+    def test_bump_changes_the_version(self):
+        version = get_master_cache_version(404)
+        bump_master_cache_version(404)
+        self.assertNotEqual(get_master_cache_version(404), version)
+
+
+class MasterCacheSignalTests(TestCase):
+    def setUp(self):
+        self.master = Master.objects.create(full_name='Əli Məmmədov', phone_number='+994501234567')
+
+    def test_login_keeps_the_cache(self):
+        with mock.patch('users.signals.invalidate_master_cache') as invalidate_master_cache:
+            self.master.save(update_fields=['last_login'])
+        invalidate_master_cache.assert_not_called()
+
+    def test_profile_changes_clear_the_cache(self):
+        with mock.patch('users.signals.invalidate_master_cache') as invalidate_master_cache:
+            self.master.save(update_fields=['note'])
+        invalidate_master_cache.assert_called_once_with(self.master.pk)
+
+
+class MasterSaveTests(TestCase):
+    def test_save_keeps_the_stored_ranking_score(self):
+        master = Master.objects.create(full_name='Əli Məmmədov', phone_number='+994501234567')
+        Master.objects.filter(pk=master.pk).update(ranking_score=4.2)
+        master.note = 'yeni qeyd'
+        master.save()
+        master.refresh_from_db()
+        self.assertEqual(master.ranking_score, 4.2)
+        self.assertEqual(master.note, 'Yeni qeyd')
+
+    def test_new_masters_are_inserted(self):
+        master = Master(full_name='Əli Məmmədov', phone_number='+994501234567')
+        master.save()
+        self.assertTrue(Master.objects.filter(pk=master.pk, slug=master.slug).exists())
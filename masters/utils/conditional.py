@@ -0,0 +1,56 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+from rest_framework.views import status
+
+
+def make_cache_entry(data):
+    """
+    Wraps response data with the validators needed for conditional GET.
+
+    The ETag is a hash of the canonical JSON of the data, so it only changes
+    when the content does. Last-Modified is the time the entry was built.
+    """
+    body = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8')
+    return {
+        'data': data,
+        'etag': quote_etag(hashlib.md5(body).hexdigest()),
+        'last_modified': int(time.time()),
+    }
+
+
+def get_cache_entry(cache_key):
+    """
+    Returns a cache entry built by `make_cache_entry`, or None on a miss.
+    Values cached in an older format are treated as a miss.
+    """
+    entry = cache.get(cache_key)
+    if isinstance(entry, dict) and 'etag' in entry:
+        return entry
+    return None
+
+
+def conditional_response(request, entry):
+    """
+    Answers If-None-Match / If-Modified-Since with 304 when the entry is
+    unchanged, otherwise returns the entry's data with ETag and Last-Modified set.
+    """
+    not_modified = get_conditional_response(
+        request,
+        etag=entry['etag'],
+        last_modified=entry['last_modified'],
+    )
+    headers = {
+        'ETag': entry['etag'],
+        'Last-Modified': http_date(entry['last_modified']),
+    }
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+    return Response(entry['data'], status=status.HTTP_200_OK, headers=headers)
@@ -1,4 +1,10 @@
 GENDER_STATUS = [
         ('man', 'Kişi'),
         ('woman', 'Qadın')
-    ]
\ No newline at end of file
+    ]
+
+
+REVIEW_CRITERIA = [
+    'responsible', 'neat', 'time_management', 'communicative', 'punctual',
+    'professional', 'experienced', 'efficient', 'agile', 'patient'
+]
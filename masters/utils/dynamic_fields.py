@@ -0,0 +1,119 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from drf_yasg import openapi
+from rest_framework import serializers
+
+
+fields_param = openapi.Parameter(
+    'fields', openapi.IN_QUERY,
+    description="Vergüllə ayrılmış sahələr, məsələn: id,full_name,cities. Göndərilməsə bütün sahələr qaytarılır",
+    type=openapi.TYPE_STRING
+)
+expand_param = openapi.Parameter(
+    'expand', openapi.IN_QUERY,
+    description="ID əvəzinə tam obyekt kimi qaytarılacaq əlaqəli sahələr, məsələn: profession_category,cities",
+    type=openapi.TYPE_STRING
+)
+
+
+def parse_list_param(request, name):
+    """
+    Reads a comma separated query parameter as a list of names.
+    Returns None when the parameter is missing or empty.
+    """
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    names = [item.strip() for item in value.split(',') if item.strip()]
+    return names or None
+
+
+class DynamicFieldsMixin:
+    """
+    ModelSerializer mixin for client-selected field subsets and related object expansion.
+
+    Accepts two extra keyword arguments:
+    - fields (list): Only these fields are serialized. Unknown names are ignored.
+    - expand (list): Related fields listed in `Meta.expandable_fields` are
+      serialized as nested objects instead of primary keys.
+
+    `Meta.expandable_fields` maps a field name to a serializer class and the
+    keyword arguments it is built with, e.g. {'cities': (CitySerializer, {'many': True})}.
+
+    Querysets should go through `setup_queryset` with the same arguments, so
+    only the selected columns are read and only the needed relations are joined.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        self._expanded = [name for name in (expand or []) if name in expandable and name in self.fields]
+        for name in self._expanded:
+            serializer_class, options = expandable[name]
+            self.fields[name] = serializer_class(read_only=True, **options)
+
+    @classmethod
+    def setup_queryset(cls, queryset, fields=None, expand=None, extra_columns=()):
+        """
+        Narrows a queryset to the columns and relations used by the selected fields.
+
+        `extra_columns` are loaded even when not serialized, e.g. the ordering
+        columns a cursor paginator reads. Falls back to loading every column
+        when a selected field is not backed by a model field, since its
+        dependencies cannot be known here.
+        """
+        serializer = cls(fields=fields, expand=expand)
+        model = queryset.model
+        columns = {model._meta.pk.name, *extra_columns}
+        select_related = []
+        prefetches = []
+        narrow = True
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                narrow = False
+                continue
+
+            expanded = name in serializer._expanded
+            nested_class = getattr(field, 'child', field).__class__
+            if model_field.many_to_many or model_field.one_to_many:
+                related_queryset = model_field.related_model.objects.all()
+                # A reverse foreign key is needed to attach the prefetched rows to their parent.
+                related_columns = (model_field.field.attname,) if model_field.one_to_many else ()
+                if not expanded:
+                    related_queryset = related_queryset.only('pk', *related_columns)
+                elif hasattr(nested_class, 'setup_queryset'):
+                    related_queryset = nested_class.setup_queryset(related_queryset, extra_columns=related_columns)
+                prefetches.append(Prefetch(field.source, queryset=related_queryset))
+            elif model_field.concrete:
+                columns.add(field.source)
+                if expanded and hasattr(nested_class, 'setup_queryset'):
+                    related_queryset = nested_class.setup_queryset(model_field.related_model.objects.all())
+                    prefetches.append(Prefetch(field.source, queryset=related_queryset))
+                elif expanded and model_field.is_relation:
+                    select_related.append(field.source)
+                    select_related.extend(
+                        f'{field.source}__{nested.source}'
+                        for nested in field.fields.values()
+                        if isinstance(nested, serializers.RelatedField)
+                        and not isinstance(nested, serializers.PrimaryKeyRelatedField)
+                    )
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        if narrow:
+            queryset = queryset.only(*columns)
+        return queryset
@@ -0,0 +1,146 @@
+import math
+
+from django.db.models import F, Q, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+
+EARTH_RADIUS_KM = 6371.0
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Encodes a point as a geohash string.
+
+    Points that share a geohash prefix lie in the same grid cell,
+    so a prefix match on an indexed column is a cheap spatial filter.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+
+def geohash_cell_size(precision):
+    """
+    Returns the (latitude, longitude) size in degrees of a geohash cell.
+    """
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Returns (min_lat, max_lat, min_lon, max_lon) of a box enclosing the circle.
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lon_delta = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+    return (
+        max(latitude - lat_delta, -90.0),
+        min(latitude + lat_delta, 90.0),
+        max(longitude - lon_delta, -180.0),
+        min(longitude + lon_delta, 180.0),
+    )
+
+
+def covering_geohashes(latitude, longitude, radius_km, max_cells=9):
+    """
+    Returns the geohash prefixes of the grid cells that cover the circle.
+
+    Picks the longest prefix length for which the bounding box is covered
+    by at most `max_cells` cells, so the prefilter stays a handful of
+    index range scans while discarding as much as possible.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = geohash_cell_size(precision)
+        rows = math.floor(max_lat / cell_lat) - math.floor(min_lat / cell_lat) + 1
+        columns = math.floor(max_lon / cell_lon) - math.floor(min_lon / cell_lon) + 1
+        if rows * columns > max_cells:
+            continue
+
+        cells = set()
+        for row in range(rows):
+            lat = min(min_lat + row * cell_lat, max_lat)
+            for column in range(columns):
+                lon = min(min_lon + column * cell_lon, max_lon)
+                cells.add(encode_geohash(lat, lon, precision))
+        for lat in (min_lat, max_lat):
+            for lon in (min_lon, max_lon):
+                cells.add(encode_geohash(lat, lon, precision))
+        return sorted(cells)
+
+    return []
+
+
+def haversine_distance(latitude, longitude):
+    """
+    Database expression for the great-circle distance in kilometres between
+    the row's latitude/longitude and the given point.
+    """
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    half_dlat = (Radians(F('latitude')) - Value(lat, output_field=FloatField())) / 2
+    half_dlon = (Radians(F('longitude')) - Value(lon, output_field=FloatField())) / 2
+    a = Power(Sin(half_dlat), 2) + Value(math.cos(lat), output_field=FloatField()) * Cos(
+        Radians(F('latitude'))
+    ) * Power(Sin(half_dlon), 2)
+    return Value(2 * EARTH_RADIUS_KM, output_field=FloatField()) * ASin(Sqrt(a))
+
+
+def filter_nearby(queryset, latitude, longitude, radius_km):
+    """
+    Restricts a Master queryset to rows within `radius_km` of the point,
+    annotated with `distance` and ordered nearest first.
+
+    Rows are first narrowed by indexed geohash prefixes and the bounding box;
+    the exact haversine distance is only computed for the survivors.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    cell_filter = Q()
+    for cell in covering_geohashes(latitude, longitude, radius_km):
+        cell_filter |= Q(geohash__startswith=cell)
+
+    return queryset.filter(
+        cell_filter,
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    ).annotate(
+        distance=haversine_distance(latitude, longitude)
+    ).filter(
+        distance__lte=radius_km
+    ).order_by('distance', 'id')
@@ -0,0 +1,153 @@
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.conditional import make_cache_entry, get_cache_entry
+
+
+VERSION_KEY = 'master_cache:{master_id}:version'
+RESPONSE_KEY = 'master_cache:{master_id}:v{version}:{name}:{params}'
+HITS_KEY = 'master_cache:hits'
+MISSES_KEY = 'master_cache:misses'
+
+
+def _incr(key, delta=1):
+    if not delta:
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+
+
+def _version_timeout():
+    # Outlives the responses cached under a version. Expired keys are harmless,
+    # and ids from the URL that are never used again do not stay in Redis.
+    return settings.MASTER_CACHE_TIMEOUT * 2
+
+
+def get_master_cache_version(master_id):
+    """
+    Returns the current cache version of a master, creating it on first use.
+
+    New versions start from the current time in milliseconds so that a
+    version key lost to eviction or expiry never points back at old responses.
+    """
+    key = VERSION_KEY.format(master_id=master_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=_version_timeout())
+        version = cache.get(key)
+    return version
+
+
+def bump_master_cache_version(master_id):
+    """
+    Makes every cached response of the master stale at once.
+    """
+    key = VERSION_KEY.format(master_id=master_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=_version_timeout())
+
+
+def request_params_key(request):
+    """
+    Builds a stable cache key fragment from the request's query parameters.
+    """
+    return urlencode(sorted(request.query_params.lists()), doseq=True)
+
+
+def get_or_set_master_response(master_id, name, builder, params=''):
+    """
+    Returns the cached response entry for a master, building and caching it on a miss.
+
+    Args:
+        master_id (int): The master the response belongs to.
+        name (str): Name of the cached view, e.g. 'detail' or 'reviews'.
+        builder (callable): Returns the response data. May raise Http404,
+            in which case nothing is cached.
+        params (str, optional): Query string fragment that varies the response.
+
+    Returns:
+        dict: Entry from `utils.conditional.make_cache_entry` holding the
+        data together with its ETag and Last-Modified values.
+    """
+    version = get_master_cache_version(master_id)
+    key = RESPONSE_KEY.format(master_id=master_id, version=version, name=name, params=params)
+    entry = get_cache_entry(key)
+    if entry is not None:
+        _incr(HITS_KEY)
+        return entry
+
+    _incr(MISSES_KEY)
+    entry = make_cache_entry(builder())
+    cache.set(key, entry, timeout=settings.MASTER_CACHE_TIMEOUT)
+    return entry
+
+
+def get_many_master_responses(master_ids, name, builder):
+    """
+    Multi-get counterpart of `get_or_set_master_response` for responses
+    that do not vary by query parameters.
+
+    Versions and responses are each read with a single `get_many`, and all
+    misses are built together so the database is hit at most once.
+
+    Args:
+        master_ids (list): Masters to look up.
+        name (str): Name of the cached response, e.g. 'card'.
+        builder (callable): Takes the list of missed ids and returns a dict
+            of master id to response data. Ids left out of the dict are
+            treated as not found and are not cached.
+
+    Returns:
+        dict: Master id to response data for every master that was found.
+    """
+    version_keys = {master_id: VERSION_KEY.format(master_id=master_id) for master_id in master_ids}
+    versions = cache.get_many(version_keys.values())
+    response_keys = {
+        master_id: RESPONSE_KEY.format(
+            master_id=master_id,
+            version=versions.get(key) or get_master_cache_version(master_id),
+            name=name,
+            params=''
+        )
+        for master_id, key in version_keys.items()
+    }
+
+    cached = cache.get_many(response_keys.values())
+    results = {
+        master_id: cached[key]
+        for master_id, key in response_keys.items() if key in cached
+    }
+    missed = [master_id for master_id in master_ids if master_id not in results]
+    _incr(HITS_KEY, len(results))
+    _incr(MISSES_KEY, len(missed))
+
+    if missed:
+        built = builder(missed)
+        cache.set_many(
+            {response_keys[master_id]: data for master_id, data in built.items()},
+            timeout=settings.MASTER_CACHE_TIMEOUT
+        )
+        results.update(built)
+    return results
+
+
+def get_master_cache_stats():
+    """
+    Returns the hit and miss counters of the per-master response cache.
+    """
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+    }
@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 
 
 class CustomPagination(PageNumberPagination):
@@ -27,3 +27,14 @@ class PaginationForReviewPage(PageNumberPagination):
     page_size = 5
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+class ReviewCursorPagination(CursorPagination):
+    """
+    Keyset pagination for review lists ordered by (created_at, id).
+    Runs no COUNT(*) and no OFFSET, so every page costs the same however deep it is.
+    """
+    page_size = 8
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
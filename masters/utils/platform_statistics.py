@@ -0,0 +1,75 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models.statistics_model import PlatformStatistics
+
+
+STATISTICS_KEY = 'platform_statistics'
+REVALIDATE_LOCK_KEY = 'platform_statistics:revalidate_lock'
+
+logger = logging.getLogger(__name__)
+
+
+def master_count_label(master_count):
+    """
+    Rounds the number of active masters down to the label shown on the landing page.
+    """
+    if master_count <= 50:
+        return str(master_count)
+    elif master_count <= 100:
+        return "100+"
+    elif master_count <= 200:
+        return "200+"
+    elif master_count <= 500:
+        return "500+"
+    return "1000+"
+
+
+def build_statistics_data(statistics):
+    return {
+        "usta_sayi": master_count_label(statistics.active_master_count),
+        "xidmet_novu": statistics.category_count,
+        "ortalama_reytinq": statistics.average_rating,
+    }
+
+
+def cache_platform_statistics(statistics=None):
+    """
+    Stores the statistics response in the cache. The entry never expires;
+    it is only marked fresh for PLATFORM_STATISTICS_FRESH_SECONDS.
+    """
+    statistics = statistics or PlatformStatistics.objects.get_solo()
+    data = build_statistics_data(statistics)
+    cache.set(STATISTICS_KEY, {
+        'data': data,
+        'fresh_until': time.time() + settings.PLATFORM_STATISTICS_FRESH_SECONDS,
+    }, timeout=None)
+    cache.delete(REVALIDATE_LOCK_KEY)
+    return data
+
+
+def get_platform_statistics():
+    """
+    Returns the landing page statistics with stale-while-revalidate semantics.
+
+    A fresh entry is returned as is. A stale entry is returned immediately
+    while a single background task, guarded by a cache lock, rebuilds it.
+    Only a cold cache builds the entry inline, from the precomputed record.
+    """
+    entry = cache.get(STATISTICS_KEY)
+    if entry is None:
+        return cache_platform_statistics()
+
+    if entry['fresh_until'] < time.time():
+        if cache.add(REVALIDATE_LOCK_KEY, 1, timeout=settings.PLATFORM_STATISTICS_FRESH_SECONDS):
+            from core.tasks import revalidate_platform_statistics
+            try:
+                revalidate_platform_statistics.delay()
+            except Exception as e:
+                # The stale entry is still served; the next request tries again.
+                logger.warning(f"Could not schedule platform statistics revalidation: {e}")
+                cache.delete(REVALIDATE_LOCK_KEY)
+    return entry['data']